@@ -0,0 +1,34 @@
+from .kernels import (
+    EMPTY, BURNING, BURNED, GRID_DTYPE, count_states, update_counts, fire_is_out,
+    diffusion_probs, update_grid, update_grid_diffusion, update_grid_terrain,
+    update_grid_loop, update_grid_diffusion_loop,
+)
+from .front import initialize_front, update_front, update_front_diffusion, update_front_terrain, front_stepper
+from .ensemble import initialize_ensemble, run_ensemble_counts, run_ensemble, run_ensemble_wind
+from .simulation import (
+    ENGINES, MODELS, initialize_grid, initialize_grid_wind, model_step, run_model,
+    run_simulation, run_simulation_wind, run_simulation_terrain,
+    run_simulations_with_averages, run_simulations_with_averages_wind,
+)
+from .sweep import replica_seed, run_replica, run_sweep
+from .stats import RunningStats, EnsembleStatistics
+from .tiled import TiledSimulation, run_tiled_simulation_wind
+from .trajectory import TrajectoryWriter, TrajectoryReader, record_simulation, resume_simulation
+from .render import PALETTE, to_rgb, encode_png, write_png, FrameWriter, GridView, export_frames
+from .profiling import Profiler
+from .adaptive import relative_half_widths, run_adaptive_sweep
+from .terrain import wind_bonus, spread_probability_fields, cached_spread_probability_fields
+from .plotting import (
+    plot_evolution, plot_average_evolution, plot_comparative_metrics, plot_heatmap, animate_simulation,
+)
+from .arrival import (
+    sample_delays, sample_delays_diffusion, sample_delays_terrain, arrival_times, arrival_counts,
+    run_arrival_simulation, run_arrival_simulation_wind,
+)
+from .percolation import (
+    sample_open_edges, reachable, run_percolation, run_percolation_wind, burned_area_distribution,
+)
+from .stream import Frame, stream, stream_simulation, stream_simulation_wind, broadcast, QueueSubscriber, CountsCollector
+from .store import ResultStore, aggregate
+from .counterrng import CounterRNG
+from .spatial import SpatialStats, ignition_steps, run_spatial_sweep
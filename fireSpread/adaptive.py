@@ -0,0 +1,82 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .simulation import GRID_SIZE, ITERATIONS
+from .stats import EnsembleStatistics
+from .sweep import MODELS, _run_job, ordered_map
+
+# Monte Carlo secuencial adaptativo: cada configuración recibe réplicas por
+# lotes hasta que los intervalos de confianza de las curvas promedio, de
+# spread_rate y de extinction_time son suficientemente estrechos, o hasta
+# agotar max_replicas. Las semillas son las de run_sweep (una por
+# configuración y réplica), así que el resultado no depende de `workers`.
+
+# Semiancho relativo a la media: en las curvas, el mayor semiancho dividido
+# por el pico de la curva media (0 si no hay variación, inf si la media es 0
+# y sí la hay)
+def _relative(stats, level):
+    half, scale = np.max(stats.half_width(level)), np.max(np.abs(stats.mean))
+    if scale > 0:
+        return float(half / scale)
+    return 0.0 if half == 0 else float("inf")
+
+# Semianchos de los intervalos de confianza relativos a la media de cada
+# magnitud (una tolerancia de 0.01 pide la media con un 1 % de error)
+def relative_half_widths(stats, level=0.95):
+    return {
+        "empty": _relative(stats.empty, level),
+        "burning": _relative(stats.burning, level),
+        "burned": _relative(stats.burned, level),
+        "spread_rate": _relative(stats.spread_rate, level),
+        "extinction_time": _relative(stats.extinction_time, level),
+    }
+
+# Todas las configuraciones avanzan a la vez: en cada ronda se envía el
+# siguiente lote de cada configuración que aún no converge, de modo que el
+# pool recibe los lotes de todas y no espera a que termine cada una. Las
+# réplicas de cada configuración se acumulan en su orden.
+def run_adaptive_sweep(simulations, model="sir", tolerance=0.01, level=0.95, min_replicas=10,
+                       max_replicas=1000, batch_size=10, master_seed=0, max_iter=ITERATIONS,
+                       grid_size=GRID_SIZE, workers=1):
+    if model not in MODELS:
+        raise ValueError(f"Modelo desconocido: {model!r} (opciones: {', '.join(MODELS)})")
+    if min_replicas < 2:
+        raise ValueError(f"min_replicas debe ser al menos 2 para estimar la varianza (recibido {min_replicas})")
+    workers = workers or os.cpu_count() or 1
+    args = (simulations, model, tolerance, level, min_replicas, max_replicas, batch_size, master_seed, max_iter,
+            grid_size)
+    if workers == 1:
+        return _adapt_all(None, workers, *args)
+    with ProcessPoolExecutor(workers) as pool:
+        return _adapt_all(pool, workers, *args)
+
+# Añade lotes de réplicas a las configuraciones hasta que todas convergen
+def _adapt_all(pool, workers, simulations, model, tolerance, level, min_replicas, max_replicas, batch_size,
+               master_seed, max_iter, grid_size):
+    stats = [EnsembleStatistics(max_iter, sim.get("grid_size", grid_size) ** 2) for sim in simulations]
+    converged = [False] * len(simulations)
+    active = list(range(len(simulations)))
+    while active:
+        batches = []
+        for c in active:
+            first = stats[c].count
+            last = min(max(first + batch_size, min_replicas), max_replicas)
+            batches.append((c, last - first))
+        jobs = [(model, simulations[c], master_seed, c, r, max_iter, grid_size)
+                for c, count in batches for r in range(stats[c].count, stats[c].count + count)]
+        results = ordered_map(_run_job, jobs, workers, pool=pool)
+        for c, count in batches:
+            for _ in range(count):
+                stats[c].add_run(*next(results))
+            converged[c] = max(relative_half_widths(stats[c], level).values()) <= tolerance
+        active = [c for c in active if not converged[c] and stats[c].count < max_replicas]
+
+    return [{
+        **sim,
+        **stats[c].summary(level),
+        "replicas_used": stats[c].count,
+        "converged": converged[c],
+        "relative_half_widths": relative_half_widths(stats[c], level),
+    } for c, sim in enumerate(simulations)]
@@ -0,0 +1,131 @@
+import heapq
+
+import numpy as np
+
+from .kernels import EMPTY, BURNING, BURNED, NEIGHBOURS, diffusion_probs
+from .simulation import ITERATIONS, initialize_grid, initialize_grid_wind
+
+# Solver por eventos de tiempos de llegada. En lugar de avanzar la cuadrícula
+# paso a paso se sortean de antemano los retardos de ignición de cada arista
+# (celda -> vecino) según las reglas de update_grid / update_grid_diffusion y
+# el tiempo de ignición de cada celda se obtiene como el camino mínimo desde
+# los focos (Dijkstra con cola de prioridad), en O(N log N) por realización
+# sin importar el número de iteraciones.
+#
+# La equivalencia con el modelo por pasos es exacta en distribución: cada
+# arista se intenta solo mientras la celda fuente arde y un intento sobre un
+# vecino que ya estaba encendido no cambia su tiempo de llegada, así que basta
+# con el primer intento con éxito de cada arista. Como en los kernels, las
+# celdas del borde pueden encenderse pero no propagan el fuego ni se apagan.
+
+# Número de fracasos antes del primer éxito (geométrica en {0, 1, ...}) con
+# probabilidad de éxito `p`, por inversión a partir de uniformes `u` en [0, 1)
+def _failures(u, p):
+    p = np.broadcast_to(p, u.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        failures = np.floor(np.log1p(-u) / np.log1p(-np.minimum(p, 1)))
+    failures[p >= 1] = 0
+    failures[p <= 0] = np.inf
+    return failures
+
+# Anula las aristas que salen del borde (las celdas del borde nunca propagan)
+# y marca que las celdas del borde arden indefinidamente
+def _border(delays, durations):
+    for values in (*delays, durations):
+        values[[0, -1], :] = np.inf
+        values[:, [0, -1]] = np.inf
+    return delays, durations
+
+# Retardos del modelo SIR (beta/gamma). Una celda encendida en t sigue
+# ardiendo K pasos (K fracasos de la recuperación, prob. gamma) y se quema en
+# t + K + 1; en cada uno de esos K pasos intenta encender cada vecino con
+# probabilidad beta, así que la arista tarda 1 + m pasos (m fracasos de beta)
+# y solo está abierta si m < K. Devuelve los retardos (4, H, W) (inf si la
+# arista está cerrada) y la duración de la combustión de cada celda (H, W).
+def sample_delays(shape, beta, gamma, rng=None):
+    rng = np.random if rng is None else rng
+    draws = rng.random((5, *shape))
+    burning_steps = _failures(draws[0], gamma)
+    attempts = _failures(draws[1:], beta)
+    delays = np.where(attempts < burning_steps, attempts + 1, np.inf)
+    return _border(delays, burning_steps + 1)
+
+# Retardos del modelo de difusión con viento: la celda arde un único paso y
+# cada arista se abre (retardo 1) con la probabilidad de su dirección
+def sample_delays_diffusion(shape, diffusion_rate, wind_direction, wind_influence, rng=None):
+    probs = diffusion_probs(diffusion_rate, wind_direction, wind_influence)
+    return sample_delays_terrain(np.broadcast_to(probs[:, None, None], (4, *shape)), rng)
+
+# Retardos del modelo de difusión sobre terreno heterogéneo: `fields` (4, H, W)
+# como en update_grid_terrain
+def sample_delays_terrain(fields, rng=None):
+    rng = np.random if rng is None else rng
+    draws = rng.random(fields.shape)
+    delays = np.where(draws < fields, 1.0, np.inf)
+    return _border(delays, np.ones(fields.shape[1:]))
+
+# Tiempos de ignición (arrival) y de apagado (burnout) de cada celda a partir
+# de la cuadrícula inicial: las celdas en llamas arden desde t = 0, las ya
+# quemadas cuentan como quemadas en t = 0 y las que nunca se alcanzan quedan
+# en inf. Las celdas del borde que se encienden no se apagan (burnout inf).
+def arrival_times(grid, delays, durations):
+    height, width = grid.shape
+    arrival = np.full(grid.size, np.inf)
+    burned = np.flatnonzero(grid == BURNED)
+    arrival[burned] = 0
+
+    sources = np.flatnonzero(grid == BURNING)
+    arrival[sources] = 0
+    queue = [(0.0, int(cell)) for cell in sources]
+    offsets = [dx * width + dy for dx, dy in NEIGHBOURS]
+    # Solo se leen los retardos de las celdas que salen de la cola (con
+    # .item(), sin convertir los campos completos), así que el coste depende
+    # del tamaño del incendio y no del de la cuadrícula
+    edges = delays.reshape(4, -1)
+    while queue:
+        time, cell = heapq.heappop(queue)
+        if time > arrival.item(cell):
+            continue  # Entrada obsoleta: la celda ya se alcanzó antes
+        for k in range(4):
+            delay = edges.item(k, cell)
+            if delay == np.inf:
+                continue
+            target = cell + offsets[k]
+            if time + delay < arrival.item(target):
+                arrival[target] = time + delay
+                heapq.heappush(queue, (time + delay, target))
+
+    burnout = arrival + durations.reshape(-1)
+    burnout[burned] = 0
+    return arrival.reshape(grid.shape), burnout.reshape(grid.shape)
+
+# Conteos (EMPTY, BURNING, BURNED) en cada paso 0..max_iter-1, forma
+# (3, max_iter), iguales a los de run_ensemble_counts para una réplica: se
+# apilan con np.stack(..., axis=1) para EnsembleStatistics.add_counts
+def arrival_counts(arrival, burnout, max_iter=ITERATIONS):
+    def reached_by(times):
+        times = times[times < max_iter].astype(np.intp)
+        return np.cumsum(np.bincount(times, minlength=max_iter))
+
+    ignited, burned = reached_by(arrival.reshape(-1)), reached_by(burnout.reshape(-1))
+    counts = np.empty((3, max_iter), dtype=np.int64)
+    counts[EMPTY] = arrival.size - ignited
+    counts[BURNING] = ignited - burned
+    counts[BURNED] = burned
+    return counts
+
+# Simulación SIR (beta/gamma) resuelta por eventos: devuelve el mapa de
+# tiempos de llegada (inf = no se quema) y los conteos por paso
+def run_arrival_simulation(beta, gamma, grid_size, max_iter=ITERATIONS, rng=None):
+    grid = initialize_grid(grid_size, rng)
+    arrival, burnout = arrival_times(grid, *sample_delays(grid.shape, beta, gamma, rng))
+    return arrival, arrival_counts(arrival, burnout, max_iter)
+
+# Simulación de difusión con viento resuelta por eventos
+def run_arrival_simulation_wind(diffusion_rate, wind_direction, wind_influence, grid_size,
+                                max_iter=ITERATIONS, rng=None):
+    grid, vegetation = initialize_grid_wind(grid_size, rng)
+    delays, durations = sample_delays_diffusion(grid.shape, diffusion_rate, wind_direction,
+                                                wind_influence, rng)
+    arrival, burnout = arrival_times(grid, delays, durations)
+    return arrival, arrival_counts(arrival, burnout, max_iter)
@@ -0,0 +1,12 @@
+import os
+
+import numpy as np
+
+# Escritura atómica de archivos .npz: se escribe a un temporal y se renombra,
+# así que tras una interrupción el archivo queda completo o no existe.
+# `arrays` es un dict nombre -> arreglo.
+def save_npz(filename, arrays, compress=True):
+    tmp = filename + ".tmp"
+    with open(tmp, "wb") as f:
+        (np.savez_compressed if compress else np.savez)(f, **arrays)
+    os.replace(tmp, filename)
@@ -0,0 +1,176 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from .ensemble import initialize_ensemble, run_ensemble_counts
+from .front import initialize_front, update_front, update_front_diffusion
+from .kernels import BURNING, GRID_DTYPE, update_grid, update_grid_diffusion, update_grid_loop, update_grid_diffusion_loop
+from .simulation import run_simulation, run_simulation_wind
+
+# Banco de pruebas de rendimiento de los kernels de propagación.
+#
+#   python -m fireSpread.benchmark run --output baseline.json
+#   python -m fireSpread.benchmark run --quick --compare baseline.json
+#   python -m fireSpread.benchmark compare baseline.json nuevo.json --tolerance 0.15
+
+GRID_SIZES = (50, 200, 1000, 4000)
+QUICK_GRID_SIZES = (50, 200)
+DENSITIES = (0.001, 0.01, 0.1)          # Fracción de celdas en llamas
+SIR_PARAMS = ((0.3, 0.1), (0.9, 0.5))   # (beta, gamma)
+WIND_PARAMS = ((0.3, (0, 1), 0.05), (0.9, (1, 0), 0.2))  # (difusión, dirección, influencia)
+REPLICAS = (10, 50, 200)
+LOOP_MAX_SIZE = 200                     # Los bucles de referencia solo en cuadrículas pequeñas
+
+# Mide `run(setup())` `repeat` veces (la preparación queda fuera del
+# cronómetro) y devuelve la mediana de segundos por paso; `steps(resultado)`
+# indica cuántos pasos ejecutó cada llamada (uno por defecto)
+def _time(run, setup=lambda: None, repeat=5, steps=lambda result: 1):
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        result = run(args)
+        times.append((time.perf_counter() - start) / max(steps(result), 1))
+    return float(np.median(times))
+
+# Cuadrícula con una fracción `density` de celdas en llamas
+def _grid(size, density, rng):
+    grid = np.zeros((size, size), dtype=GRID_DTYPE)
+    grid[rng.random((size, size)) < density] = BURNING
+    return grid
+
+def _result(seconds, cells):
+    return {"seconds_per_step": seconds, "steps_per_second": 1 / seconds,
+            "cells_per_second": cells / seconds}
+
+# Pasos ejecutados por run_simulation (el último conteo no avanza si hubo extinción)
+def _simulation_steps(result):
+    burning_counts = result[1]
+    return len(burning_counts) - (burning_counts[-1] == 0)
+
+# Pasos ejecutados por run_ensemble_counts (hasta que todas las réplicas se extinguen)
+def _ensemble_steps(counts):
+    return int((counts[BURNING] > 0).any(axis=0).sum())
+
+# Un paso de cada motor sobre cuadrículas con distintas densidades de frente.
+# La preparación (copia de la cuadrícula para los kernels in situ y el frente
+# inicial del motor de frente, que en una simulación se mantiene entre pasos)
+# queda fuera del cronómetro.
+def _kernel_cases(sizes, repeat, rng):
+    for size in sizes:
+        for density in DENSITIES:
+            grid = _grid(size, density, rng)
+            copy, shared = (lambda: grid.copy()), (lambda: grid)
+            with_front = lambda: (grid.copy(), initialize_front(grid))
+            engines = {}
+            for beta, gamma in SIR_PARAMS:
+                tag = f"beta={beta},gamma={gamma}"
+                engines[f"update_grid[{tag}]"] = (lambda g, b=beta, c=gamma: update_grid(g, b, c, rng, g), copy)
+                engines[f"update_front[{tag}]"] = (
+                    lambda gf, b=beta, c=gamma: update_front(*gf, b, c, rng), with_front)
+                if size <= LOOP_MAX_SIZE:
+                    engines[f"update_grid_loop[{tag}]"] = (
+                        lambda g, b=beta, c=gamma: update_grid_loop(g, b, c), shared)
+            for rate, direction, influence in WIND_PARAMS:
+                tag = f"diffusion={rate},wind={direction},influence={influence}"
+                engines[f"update_grid_diffusion[{tag}]"] = (
+                    lambda g, p=(rate, direction, influence): update_grid_diffusion(g, *p, rng, g), copy)
+                engines[f"update_front_diffusion[{tag}]"] = (
+                    lambda gf, p=(rate, direction, influence): update_front_diffusion(*gf, *p, rng), with_front)
+                if size <= LOOP_MAX_SIZE:
+                    engines[f"update_grid_diffusion_loop[{tag}]"] = (
+                        lambda g, p=(rate, direction, influence): update_grid_diffusion_loop(g, *p), shared)
+            for name, (step, setup) in engines.items():
+                yield f"{name}/size={size}/density={density}", _result(_time(step, setup, repeat), grid.size)
+
+# Simulaciones completas (run_simulation) en los dos tamaños más pequeños y
+# lotes de réplicas en el más pequeño
+def _run_cases(sizes, repeat, rng, max_iter=100):
+    for size in sizes[:2]:
+        for beta, gamma in SIR_PARAMS:
+            seconds = _time(lambda _: run_simulation(beta, gamma, size, max_iter, rng), repeat=repeat,
+                            steps=_simulation_steps)
+            yield f"run_simulation[beta={beta},gamma={gamma}]/size={size}", _result(seconds, size * size)
+        for rate, direction, influence in WIND_PARAMS:
+            seconds = _time(lambda _: run_simulation_wind(rate, direction, influence, size, max_iter, rng), repeat=repeat,
+                            steps=_simulation_steps)
+            yield (f"run_simulation_wind[diffusion={rate},wind={direction},influence={influence}]/size={size}",
+                   _result(seconds, size * size))
+    size = sizes[0]
+    for replicas in REPLICAS:
+        beta, gamma = SIR_PARAMS[0]
+        step = lambda g, out, r, counters: update_grid(g, beta, gamma, r, out, counters)
+        setup = lambda: initialize_ensemble(replicas, size, rng)
+        seconds = _time(lambda grids: run_ensemble_counts(step, grids, max_iter), setup, repeat, _ensemble_steps)
+        yield f"run_ensemble_counts[beta={beta},gamma={gamma}]/size={size}/replicas={replicas}", \
+            _result(seconds, replicas * size * size)
+
+# Ejecuta la matriz completa y devuelve el informe (apto para JSON)
+def run_benchmarks(sizes=GRID_SIZES, repeat=5, seed=0, log=None):
+    rng = np.random.default_rng(seed)
+    results = {}
+    for cases in (_kernel_cases(sizes, repeat, rng), _run_cases(sizes, repeat, rng)):
+        for name, result in cases:
+            results[name] = result
+            if log is not None:
+                log(f"{name}: {result['steps_per_second']:.1f} pasos/s, {result['cells_per_second']:.3g} celdas/s")
+    return {
+        "meta": {"python": platform.python_version(), "numpy": np.__version__,
+                 "platform": platform.platform(), "sizes": list(sizes), "repeat": repeat},
+        "results": results,
+    }
+
+# Compara dos informes: devuelve los casos cuya duración empeoró más de `tolerance`
+def compare_benchmarks(baseline, current, tolerance=0.1):
+    regressions = {}
+    for name, result in current["results"].items():
+        if name in baseline["results"]:
+            ratio = result["seconds_per_step"] / baseline["results"][name]["seconds_per_step"]
+            if ratio > 1 + tolerance:
+                regressions[name] = ratio
+    return regressions
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m fireSpread.benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Ejecuta la matriz de pruebas")
+    run.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    run.add_argument("--quick", action="store_true", help=f"Solo tamaños {QUICK_GRID_SIZES}")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--compare", metavar="BASELINE", help="Compara contra una línea base")
+    run.add_argument("--tolerance", type=float, default=0.1)
+    compare = commands.add_parser("compare", help="Compara dos archivos de resultados")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        sizes = QUICK_GRID_SIZES if args.quick else GRID_SIZES
+        report = run_benchmarks(sizes, args.repeat, args.seed, log=print)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        if not args.compare:
+            return 0
+        baseline = _load(args.compare)
+    else:
+        baseline, report = _load(args.baseline), _load(args.current)
+
+    regressions = compare_benchmarks(baseline, report, args.tolerance)
+    for name, ratio in sorted(regressions.items(), key=lambda item: -item[1]):
+        print(f"MÁS LENTO x{ratio:.2f}: {name}")
+    print(f"{len(regressions)} casos más lentos que la línea base (tolerancia {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
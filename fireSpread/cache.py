@@ -0,0 +1,196 @@
+import argparse
+import functools
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from .atomic import save_npz
+
+# Caché persistente de resultados de barridos. Cada entrada guarda las curvas
+# y métricas por réplica de una configuración y se identifica por el modelo,
+# los parámetros, el tamaño de la cuadrícula, max_iter, la semilla (maestra e
+# índice de configuración, que junto con la réplica determinan su semilla) y
+# la versión del código que produce los resultados. Las réplicas son
+# independientes, así que una entrada con más réplicas de las pedidas sirve
+# su prefijo y una con menos solo obliga a simular las que faltan.
+#
+# Las entradas son archivos .npz; la fecha de modificación marca el último
+# uso y, al superar `max_bytes`, se borran las menos usadas (LRU).
+#
+#   python -m fireSpread.cache list
+#   python -m fireSpread.cache info <clave>
+#   python -m fireSpread.cache invalidate --model wind
+#   python -m fireSpread.cache invalidate --stale
+#   python -m fireSpread.cache clear
+
+DEFAULT_DIRECTORY = os.environ.get("FIRESPREAD_CACHE", ".fireSpread_cache")
+DEFAULT_MAX_BYTES = 1 << 30
+CACHE_FORMAT = 1
+
+# Módulos cuyo código determina los resultados de una réplica
+VERSIONED_MODULES = ("counterrng.py", "kernels.py", "simulation.py", "sweep.py", "terrain.py")
+
+# Huella del código que genera los resultados: cualquier cambio en estos
+# módulos invalida las entradas anteriores
+@functools.lru_cache(maxsize=None)
+def code_version():
+    digest = hashlib.sha256(str(CACHE_FORMAT).encode())
+    package = os.path.dirname(os.path.abspath(__file__))
+    for name in VERSIONED_MODULES:
+        with open(os.path.join(package, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+# Forma canónica (JSON) de los parámetros: tuplas como listas y los mapas de
+# terreno (arreglos) sustituidos por su huella
+def _canonical(value):
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        return {"array": hashlib.sha256(array.data).hexdigest(), "shape": array.shape, "dtype": array.dtype.str}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+class ResultCache:
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    # Metadatos que identifican una entrada
+    def describe(self, model, sim, grid_size, max_iter, master_seed, config_index):
+        return {"model": model, "params": _canonical(sim), "grid_size": grid_size, "max_iter": max_iter,
+                "master_seed": _canonical(master_seed), "config_index": config_index,
+                "code_version": code_version()}
+
+    @staticmethod
+    def key(description):
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    # Conteos y métricas guardados para la configuración (pueden ser menos
+    # réplicas de las necesarias) o None si no hay entrada
+    def get(self, model, sim, grid_size, max_iter, master_seed, config_index):
+        path = self._path(self.key(self.describe(model, sim, grid_size, max_iter, master_seed, config_index)))
+        try:
+            with np.load(path) as entry:
+                counts, metrics = entry["counts"], entry["metrics"]
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(path)  # Último uso, para la expulsión LRU
+        self.hits += 1
+        return counts, metrics
+
+    def put(self, model, sim, grid_size, max_iter, master_seed, config_index, counts, metrics):
+        os.makedirs(self.directory, exist_ok=True)
+        description = self.describe(model, sim, grid_size, max_iter, master_seed, config_index)
+        key = self.key(description)
+        description.update(replicas=counts.shape[1], created=time.time())
+        save_npz(self._path(key), {"counts": counts, "metrics": metrics, "meta": np.array(json.dumps(description))},
+                 compress=False)
+        self.evict()
+        return key
+
+    # Claves y tamaños de las entradas, de la más antigua a la más reciente
+    def entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        return [(key, size, mtime) for mtime, key, size in sorted(entries)]
+
+    def info(self, key):
+        with np.load(self._path(key)) as entry:
+            return json.loads(str(entry["meta"]))
+
+    # Borra las entradas menos usadas hasta quedar por debajo de max_bytes
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self.remove(key)
+            total -= size
+
+    def remove(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    # Borra las entradas que cumplen los filtros (todas si no se indica
+    # ninguno): claves (o prefijos), modelo o versión de código obsoleta.
+    # Devuelve el número de entradas borradas.
+    def invalidate(self, keys=None, model=None, stale=False):
+        removed = 0
+        for key, _, _ in self.entries():
+            if keys and not any(key.startswith(prefix) for prefix in keys):
+                continue
+            if model is not None or stale:
+                meta = self.info(key)
+                if model is not None and meta["model"] != model:
+                    continue
+                if stale and meta["code_version"] == code_version():
+                    continue
+            self.remove(key)
+            removed += 1
+        return removed
+
+    def clear(self):
+        return self.invalidate()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m fireSpread.cache")
+    parser.add_argument("--dir", default=DEFAULT_DIRECTORY, help="Directorio de la caché")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Lista las entradas (de la más antigua a la más reciente)")
+    info = commands.add_parser("info", help="Metadatos de una entrada")
+    info.add_argument("key")
+    invalidate = commands.add_parser("invalidate", help="Borra entradas por clave, modelo o versión")
+    invalidate.add_argument("keys", nargs="*", help="Claves o prefijos de clave")
+    invalidate.add_argument("--model")
+    invalidate.add_argument("--stale", action="store_true", help="Solo las de otra versión del código")
+    commands.add_parser("clear", help="Borra todas las entradas")
+    args = parser.parse_args(argv)
+    cache = ResultCache(args.dir)
+
+    if args.command == "list":
+        entries = cache.entries()
+        for key, size, mtime in entries:
+            meta = cache.info(key)
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime))
+            print(f"{key[:16]}  {meta['model']:<8} {meta['replicas']:>6} réplicas  {size / 1024:>9.1f} KiB  "
+                  f"{used}  {json.dumps(meta['params'])}")
+        print(f"{len(entries)} entradas, {sum(size for _, size, _ in entries) / 2**20:.1f} MiB")
+    elif args.command == "info":
+        matches = [key for key, _, _ in cache.entries() if key.startswith(args.key)]
+        if len(matches) != 1:
+            print(f"La clave {args.key!r} coincide con {len(matches)} entradas", file=sys.stderr)
+            return 1
+        print(json.dumps({"key": matches[0], **cache.info(matches[0])}, indent=2))
+    elif args.command == "invalidate":
+        if not (args.keys or args.model or args.stale):
+            parser.error("invalidate necesita claves, --model o --stale (para borrar todo use clear)")
+        print(f"{cache.invalidate(args.keys, args.model, args.stale)} entradas borradas")
+    else:
+        print(f"{cache.clear()} entradas borradas")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import numpy as np
+
+# Generador basado en contadores. Cada número aleatorio de los kernels es una
+# función pura de (semilla, réplica, paso, fila, columna, ranura) obtenida con
+# el mezclador de splitmix64, así que no depende del orden en que se recorren
+# las celdas: el mismo paso da el mismo resultado bit a bit con los bucles de
+# referencia, los kernels vectorizados, el motor de frente o por bloques, y
+# los números se generan en bloque sin estado compartido.
+#
+# Ranuras: 0 es la recuperación del modelo SIR y k + 1 el intento de
+# propagación hacia NEIGHBOURS[k] (en ambos modelos). Los bucles que recorren
+# la simulación llaman a `advance(rng)` después de cada paso.
+#
+# Los usos genéricos (posición del foco, vegetación) piden `random(shape)`,
+# que sale de una secuencia aparte numerada por el número de valores ya
+# entregados.
+
+_MASK = (1 << 64) - 1
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_GENERIC = 1 << 32  # Ranura de la secuencia genérica
+
+# Ranuras de los kernels
+RECOVERY_SLOT = 0
+SPREAD_SLOTS = (1, 2, 3, 4)
+
+def _splitmix(z):
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+# Combina la huella `h` con cada componente (enteros o arreglos) en orden
+def _hash(h, *components):
+    with np.errstate(over="ignore"):
+        for component in components:
+            h = _splitmix(h ^ (np.asarray(component).astype(np.uint64) + _GOLDEN))
+    return h
+
+# Uniformes en [0, 1) con los 53 bits altos de la huella
+def _uniform(h):
+    return (h >> np.uint64(11)) * (1.0 / (1 << 53))
+
+class CounterRNG:
+    def __init__(self, seed=0, replica=0, step=0, origin=(0, 0)):
+        self.seed = int(seed) & _MASK
+        self.replica = int(replica)
+        self.step = int(step)
+        self.origin = tuple(origin)
+        self.drawn = 0
+        self.replicas = None  # Índices originales de un sublote (ver select)
+        self._key = _hash(np.uint64(self.seed), self.replica)
+
+    # Uniformes de las ranuras `slots` (secuencia) para las celdas
+    # (fila, columna); `lead` da el desplazamiento de réplica de cada celda en
+    # un lote (..., H, W). Forma (len(slots), celdas).
+    def cell_random(self, slots, rows, cols, lead=0):
+        rows = np.asarray(rows) + self.origin[0]
+        cols = np.asarray(cols) + self.origin[1]
+        slots = np.asarray(slots)
+        if self.replicas is not None:
+            lead = self.replicas[lead]
+        key = self._key if np.ndim(lead) == 0 and lead == 0 else _hash(np.uint64(self.seed), self.replica + lead)
+        # Fila y columna empaquetadas en un único entero de 64 bits
+        cells = (rows.astype(np.uint64) << np.uint64(32)) | cols.astype(np.uint64)
+        h = _hash(_hash(key, self.step), cells)
+        return _uniform(_hash(h, slots[:, np.newaxis]))
+
+    # Un único número para la celda (fila, columna) y la ranura (bucles)
+    def draw(self, slot, row, col):
+        return float(self.cell_random([slot], [row], [col])[0, 0])
+
+    # Interfaz de np.random.Generator para los usos genéricos
+    def random(self, size=None):
+        count = int(np.prod(size)) if size is not None else 1
+        index = self.drawn + np.arange(count)
+        self.drawn += count
+        values = _uniform(_hash(self._key, _GENERIC, index))
+        return values.reshape(size) if size is not None else float(values[0])
+
+    # Mismo generador visto desde una ventana cuya celda (0, 0) es la celda
+    # global (row, col); comparte el paso con el original en el momento de crearla
+    def at(self, row, col):
+        view = CounterRNG(self.seed, self.replica, self.step, (self.origin[0] + row, self.origin[1] + col))
+        view.drawn = self.drawn
+        view.replicas = self.replicas
+        return view
+
+    # Mismo generador para un sublote formado por las réplicas `replicas` de
+    # un lote: la réplica i del sublote usa los números de la réplica
+    # replicas[i] del lote completo
+    def select(self, replicas):
+        view = self.at(0, 0)
+        replicas = np.asarray(replicas)
+        view.replicas = replicas if self.replicas is None else self.replicas[replicas]
+        return view
+
+    def advance(self, steps=1):
+        self.step += steps
+
+    @property
+    def state(self):
+        return {"seed": self.seed, "replica": self.replica, "step": self.step, "drawn": self.drawn}
+
+    @classmethod
+    def from_state(cls, state):
+        rng = cls(state["seed"], state["replica"], state["step"])
+        rng.drawn = state["drawn"]
+        return rng
+
+# Pasa al paso siguiente si `rng` es un CounterRNG (los generadores
+# secuenciales no lo necesitan)
+def advance(rng):
+    if isinstance(rng, CounterRNG):
+        rng.advance()
+
+# `rng` desplazado a la ventana con origen (row, col)
+def at(rng, row, col):
+    return rng.at(row, col) if isinstance(rng, CounterRNG) else rng
+
+# Generador propio de la réplica `replica` de un lote: con un CounterRNG uno
+# nuevo en el mismo paso con replica = rng.replica + replica (los mismos
+# números que esa réplica recibe dentro del lote); los demás generadores se
+# comparten
+def for_replica(rng, replica):
+    return CounterRNG(rng.seed, rng.replica + replica, rng.step) if isinstance(rng, CounterRNG) else rng
+
+# `rng` restringido a las réplicas `replicas` de un lote
+def select(rng, replicas):
+    return rng.select(replicas) if isinstance(rng, CounterRNG) else rng
+
+# Uniformes (ranuras, celdas) para las celdas `cells` = (*lead, filas,
+# columnas) de una cuadrícula con forma `shape`: con un CounterRNG dependen
+# solo de cada celda (en un lote, la réplica es la de rng más el índice del
+# lote); con otro generador se piden en bloque como siempre
+def cell_draws(rng, slots, cells, shape):
+    *lead, rows, cols = cells
+    if isinstance(rng, CounterRNG):
+        offset = np.ravel_multi_index(lead, shape[:-2]) if lead else 0
+        return rng.cell_random(slots, rows, cols, offset)
+    return rng.random((len(slots), rows.size))
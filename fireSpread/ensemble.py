@@ -0,0 +1,66 @@
+import numpy as np
+
+from .counterrng import advance, select
+from .kernels import BURNING, GRID_DTYPE, count_states, update_grid, update_grid_diffusion
+
+# Ejecución por lotes: todas las réplicas viven en un solo arreglo
+# (réplicas, H, W) y avanzan juntas en un único paso vectorizado.
+
+# Cuadrículas iniciales con un foco aleatorio en cada réplica
+def initialize_ensemble(num_simulations, size, rng=None):
+    rng = np.random if rng is None else rng
+    grids = np.zeros((num_simulations, size, size), dtype=GRID_DTYPE)
+    start = (rng.random((2, num_simulations)) * size).astype(int)
+    grids[np.arange(num_simulations), start[0], start[1]] = BURNING
+    return grids
+
+# Avanza el lote hasta max_iter y devuelve los conteos por réplica y paso,
+# con forma (3, réplicas, max_iter). Solo avanzan las réplicas con fuego: las
+# extintas se quedan fuera del paso y sus conteos se mantienen constantes,
+# igual que el relleno 'edge'/'constant' de run_simulations_with_averages.
+# El sublote recibe `select(rng, activas)`, así que con un CounterRNG cada
+# réplica conserva los números de su índice original (los mismos que si se
+# ejecutara sola con replica=índice). Los conteos se recorren una sola vez al
+# principio; después se actualizan con los contadores por réplica de los
+# kernels.
+# `step(grids, out, rng, counters)` escribe el paso en `out`; el lote se
+# actualiza in situ (out=grids). Un CounterRNG en `rng` se avanza un paso
+# tras cada actualización.
+def run_ensemble_counts(step, grids, max_iter, rng=None):
+    counts = np.zeros((3, grids.shape[0], max_iter), dtype=int)
+    current = count_states(grids)
+    for i in range(max_iter):
+        counts[:, :, i] = current
+        active = np.flatnonzero(current[BURNING])
+        if active.size == 0:
+            counts[:, :, i + 1:] = counts[:, :, i:i + 1]
+            break
+        counters = {}
+        if active.size == grids.shape[0]:
+            grids = step(grids, grids, rng, counters)
+        else:
+            batch = grids[active]
+            grids[active] = step(batch, batch, select(rng, active), counters)
+        ignitions = counters.get("replica_ignitions", 0)
+        burnouts = counters.get("replica_burnouts", 0)
+        current[:, active] += (-ignitions, ignitions - burnouts, burnouts)
+        advance(rng)
+    return counts
+
+# Promedios del modelo SIR (beta/gamma) sobre num_simulations réplicas
+def run_ensemble(beta, gamma, grid_size, num_simulations, max_iter, rng=None):
+    grids = initialize_ensemble(num_simulations, grid_size, rng)
+    step = lambda g, out, r, counters: update_grid(g, beta, gamma, r, out, counters)
+    counts = run_ensemble_counts(step, grids, max_iter, rng)
+    avg_empty, avg_burning, avg_burned = counts.mean(axis=1)
+    return avg_empty, avg_burning, avg_burned
+
+# Promedios del modelo de difusión con viento sobre num_simulations réplicas
+def run_ensemble_wind(diffusion_rate, wind_direction, wind_influence, grid_size,
+                      num_simulations, max_iter, rng=None):
+    grids = initialize_ensemble(num_simulations, grid_size, rng)
+    step = lambda g, out, r, counters: update_grid_diffusion(g, diffusion_rate, wind_direction, wind_influence,
+                                                             r, out, counters)
+    counts = run_ensemble_counts(step, grids, max_iter, rng)
+    avg_empty, avg_burning, avg_burned = counts.mean(axis=1)
+    return avg_empty, avg_burning, avg_burned
@@ -0,0 +1,89 @@
+import numpy as np
+
+from .counterrng import RECOVERY_SLOT, SPREAD_SLOTS, cell_draws
+from .kernels import EMPTY, BURNING, BURNED, NEIGHBOURS, _count, diffusion_probs
+
+# Motor de frente activo: en lugar de recorrer toda la cuadrícula solo se
+# avanzan las celdas en llamas (guardadas como índices planos) y sus vecinos.
+# La cuadrícula se modifica in situ, sin copias, así que el coste por paso
+# depende del tamaño del frente y no del área.
+
+# Índices planos de las celdas en llamas
+def initialize_front(grid):
+    return np.flatnonzero(grid == BURNING)
+
+# Separa el frente en celdas interiores (activas) y de borde (inertes: los
+# kernels originales nunca procesan los bordes, así que arden para siempre)
+def _split_front(shape, front):
+    rows, cols = np.divmod(front, shape[1])
+    interior = (rows > 0) & (rows < shape[0] - 1) & (cols > 0) & (cols < shape[1] - 1)
+    return front[interior], front[~interior]
+
+# Vecinos vacíos que se encienden a partir de las fuentes dadas; devuelve
+# también cuántos vecinos candidatos se examinaron
+def _ignite(flat, width, sources, probs, draws):
+    offsets = [dx * width + dy for dx, dy in NEIGHBOURS]
+    targets = np.concatenate([sources[draws[k] < probs[k]] + offsets[k] for k in range(4)])
+    candidates = np.unique(targets)
+    return candidates[flat[candidates] == EMPTY], targets.size
+
+# Un paso del modelo SIR (beta/gamma) sobre el frente; devuelve el nuevo frente
+def update_front(grid, front, beta, gamma, rng=None, counters=None):
+    rng = np.random if rng is None else rng
+    flat = grid.reshape(-1)
+    active, inert = _split_front(grid.shape, front)
+    draws = cell_draws(rng, (RECOVERY_SLOT, *SPREAD_SLOTS), np.divmod(active, grid.shape[1]), grid.shape)
+    recovered = draws[0] < gamma
+    spreaders = active[~recovered]
+    ignited, examined = _ignite(flat, grid.shape[1], spreaders, [beta] * 4, draws[1:, ~recovered])
+    flat[active[recovered]] = BURNED
+    flat[ignited] = BURNING
+    _count(counters, cells_examined=front.size + examined, random_draws=draws.size,
+           ignitions=ignited.size, burnouts=np.count_nonzero(recovered))
+    return np.concatenate([inert, spreaders, ignited])
+
+# Un paso del modelo de difusión con viento sobre el frente
+def update_front_diffusion(grid, front, diffusion_rate, wind_direction, wind_influence, rng=None,
+                           counters=None):
+    rng = np.random if rng is None else rng
+    flat = grid.reshape(-1)
+    active, inert = _split_front(grid.shape, front)
+    probs = diffusion_probs(diffusion_rate, wind_direction, wind_influence)
+    draws = cell_draws(rng, SPREAD_SLOTS, np.divmod(active, grid.shape[1]), grid.shape)
+    ignited, examined = _ignite(flat, grid.shape[1], active, probs, draws)
+    flat[active] = BURNED  # Las celdas del frente se queman
+    flat[ignited] = BURNING
+    _count(counters, cells_examined=front.size + examined, random_draws=draws.size,
+           ignitions=ignited.size, burnouts=active.size)
+    return np.concatenate([inert, ignited])
+
+# Un paso del modelo de difusión sobre terreno heterogéneo (campos (4, H, W)
+# de fireSpread.terrain)
+def update_front_terrain(grid, front, fields, rng=None, counters=None):
+    rng = np.random if rng is None else rng
+    flat = grid.reshape(-1)
+    active, inert = _split_front(grid.shape, front)
+    probs = fields.reshape(4, -1)[:, active]
+    draws = cell_draws(rng, SPREAD_SLOTS, np.divmod(active, grid.shape[1]), grid.shape)
+    ignited, examined = _ignite(flat, grid.shape[1], active, probs, draws)
+    flat[active] = BURNED  # Las celdas del frente se queman
+    flat[ignited] = BURNING
+    _count(counters, cells_examined=front.size + examined, random_draws=draws.size,
+           ignitions=ignited.size, burnouts=active.size)
+    return np.concatenate([inert, ignited])
+
+# Función de paso con la interfaz de los kernels, step(grid, out, counters),
+# que conserva el frente entre pasos: `update(grid, front, counters)` avanza
+# el frente y la cuadrícula se modifica in situ (se ignora `out` y se
+# devuelve la misma cuadrícula). Los contadores de igniciones y celdas
+# apagadas de update_front* mantienen los conteos del bucle sin recorrer la
+# cuadrícula.
+def front_stepper(grid, update):
+    front = initialize_front(grid)
+
+    def step(g, out, counters):
+        nonlocal front
+        front = update(g, front, counters)
+        return g
+
+    return step
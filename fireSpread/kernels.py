@@ -0,0 +1,186 @@
+import numpy as np
+
+from .counterrng import RECOVERY_SLOT, SPREAD_SLOTS, CounterRNG, cell_draws
+
+# Estados de la celda
+EMPTY = 0               # Verde (sin quemar) (Susceptible)
+BURNING = 1             # En llamas (Infected)
+BURNED = 2              # Quemado (Recovered)
+
+# Tipo compacto del estado: un byte por celda (8 veces menos que int64)
+GRID_DTYPE = np.uint8
+
+# Desplazamientos de los vecinos (arriba, abajo, izquierda, derecha)
+NEIGHBOURS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Probabilidad de propagación hacia cada dirección de NEIGHBOURS en el modelo
+# de difusión: el viento solo se suma a la dirección que coincide exactamente
+def diffusion_probs(diffusion_rate, wind_direction, wind_influence):
+    return np.array([diffusion_rate + (wind_influence if (dx, dy) == wind_direction else 0)
+                     for dx, dy in NEIGHBOURS])
+
+# Conteos (EMPTY, BURNING, BURNED) de una cuadrícula o de un lote (..., H, W)
+def count_states(grid):
+    return np.array([np.count_nonzero(grid == state, axis=(-2, -1))
+                     for state in (EMPTY, BURNING, BURNED)])
+
+# Actualiza in situ los conteos (EMPTY, BURNING, BURNED) con las transiciones
+# de un paso registradas por los kernels en `counters`, sin recorrer la cuadrícula
+def update_counts(counts, counters):
+    ignitions, burnouts = counters.get("ignitions", 0), counters.get("burnouts", 0)
+    counts += (-ignitions, ignitions - burnouts, burnouts)
+    return counts
+
+# Señal barata de extinción: no queda ninguna celda en llamas
+def fire_is_out(counts):
+    return counts[BURNING] == 0
+
+# Buffer de salida de un paso: una copia nueva si no se indica `out`, la
+# propia cuadrícula si out=grid (actualización in situ, sin copias: los
+# kernels solo leen de `grid` las celdas en llamas, que se extraen antes de
+# escribir) o `out` preasignado con el contenido de `grid`
+def _output(grid, out):
+    if out is None:
+        return grid.copy()
+    if out is not grid:
+        np.copyto(out, grid)
+    return out
+
+# Suma los contadores de un paso en `counters` (dict) cuando se pide
+# instrumentación; sin ella no hace nada
+def _count(counters, **values):
+    if counters is not None:
+        for name, value in values.items():
+            counters[name] = counters.get(name, 0) + int(value)
+
+# En un lote (..., H, W) suma también las transiciones de cada réplica en
+# `counters["replica_<nombre>"]` (un arreglo con una entrada por réplica, en
+# el orden de ravel sobre los ejes iniciales) a partir de los índices
+# iniciales de las celdas que cambiaron
+def _count_replicas(counters, shape, **leads):
+    if counters is None or len(shape) == 2:
+        return
+    size = int(np.prod(shape[:-2]))
+    for name, lead in leads.items():
+        replicas = np.bincount(np.ravel_multi_index(lead, shape[:-2]), minlength=size)
+        counters[f"replica_{name}"] = counters.get(f"replica_{name}", 0) + replicas
+
+# Índices (..., fila, columna) de las celdas que pueden propagar el fuego:
+# solo el interior de la cuadrícula, igual que en los bucles originales
+# (los bordes nunca se procesan)
+def _interior_burning(grid):
+    *lead, rows, cols = np.nonzero(grid[..., 1:-1, 1:-1] == BURNING)
+    return (*lead, rows + 1, cols + 1)
+
+# Propaga el fuego desde las celdas fuente hacia sus vecinos vacíos.
+# `probs` contiene una probabilidad por dirección y `draws` un número
+# aleatorio por (dirección, celda fuente). Devuelve el número de celdas
+# encendidas (se comprueba sobre new_grid para no contar dos veces una celda
+# alcanzada desde dos direcciones) y sus índices iniciales en un lote.
+def _spread(new_grid, sources, probs, draws):
+    *lead, rows, cols = sources
+    ignitions, ignited = 0, []
+    for k, (dx, dy) in enumerate(NEIGHBOURS):
+        hit = draws[k] < probs[k]
+        targets = (*(axis[hit] for axis in lead), rows[hit] + dx, cols[hit] + dy)
+        empty = new_grid[targets] == EMPTY
+        new_grid[tuple(axis[empty] for axis in targets)] = BURNING
+        ignitions += np.count_nonzero(empty)
+        ignited.append(tuple(axis[empty] for axis in targets[:-2]))
+    return ignitions, tuple(np.concatenate(axes) for axes in zip(*ignited))
+
+# Actualización vectorizada del modelo SIR (beta/gamma) sobre toda la cuadrícula.
+# Acepta también lotes de cuadrículas con forma (..., H, W). Si se pasa
+# `counters` (dict) se acumulan en él celdas examinadas, números aleatorios,
+# igniciones y celdas apagadas (en un lote, también por réplica).
+def update_grid(grid, beta, gamma, rng=None, out=None, counters=None):
+    rng = np.random if rng is None else rng
+    new_grid = _output(grid, out)
+    burning = _interior_burning(grid)
+    # Un único sorteo por paso: recuperación + uno por cada vecino
+    draws = cell_draws(rng, (RECOVERY_SLOT, *SPREAD_SLOTS), burning, grid.shape)
+    recovered = draws[0] < gamma
+    new_grid[burning] = np.where(recovered, BURNED, BURNING)
+    spreaders = tuple(axis[~recovered] for axis in burning)
+    ignitions, ignited = _spread(new_grid, spreaders, [beta] * 4, draws[1:, ~recovered])
+    _count(counters, cells_examined=grid.size, random_draws=draws.size,
+           ignitions=ignitions, burnouts=np.count_nonzero(recovered))
+    _count_replicas(counters, grid.shape, ignitions=ignited,
+                    burnouts=tuple(axis[recovered] for axis in burning[:-2]))
+    return new_grid
+
+# Actualización vectorizada del modelo de difusión con viento
+def update_grid_diffusion(grid, diffusion_rate, wind_direction, wind_influence, rng=None, out=None,
+                          counters=None):
+    rng = np.random if rng is None else rng
+    new_grid = _output(grid, out)
+    burning = _interior_burning(grid)
+    new_grid[burning] = BURNED  # La celda se quema
+    probs = diffusion_probs(diffusion_rate, wind_direction, wind_influence)
+    draws = cell_draws(rng, SPREAD_SLOTS, burning, grid.shape)
+    ignitions, ignited = _spread(new_grid, burning, probs, draws)
+    _count(counters, cells_examined=grid.size, random_draws=draws.size,
+           ignitions=ignitions, burnouts=burning[0].size)
+    _count_replicas(counters, grid.shape, ignitions=ignited, burnouts=burning[:-2])
+    return new_grid
+
+# Actualización vectorizada del modelo de difusión sobre un terreno
+# heterogéneo: `fields` (4, H, W) da la probabilidad de cada celda de encender
+# a su vecino en cada dirección (ver fireSpread.terrain)
+def update_grid_terrain(grid, fields, rng=None, out=None, counters=None):
+    rng = np.random if rng is None else rng
+    new_grid = _output(grid, out)
+    burning = _interior_burning(grid)
+    new_grid[burning] = BURNED  # La celda se quema
+    probs = fields[:, burning[-2], burning[-1]]
+    draws = cell_draws(rng, SPREAD_SLOTS, burning, grid.shape)
+    ignitions, ignited = _spread(new_grid, burning, probs, draws)
+    _count(counters, cells_examined=grid.size, random_draws=draws.size,
+           ignitions=ignitions, burnouts=burning[0].size)
+    _count_replicas(counters, grid.shape, ignitions=ignited, burnouts=burning[:-2])
+    return new_grid
+
+# Implementaciones de referencia con bucles (celda por celda). Con un
+# CounterRNG cada decisión usa el número de su celda y ranura, así que el
+# resultado coincide bit a bit con los kernels vectorizados.
+def _loop_draw(rng):
+    if rng is None:
+        return lambda slot, i, j: np.random.rand()
+    if isinstance(rng, CounterRNG):
+        return rng.draw
+    return lambda slot, i, j: rng.random()
+
+def update_grid_loop(grid, beta, gamma, rng=None):
+    draw = _loop_draw(rng)
+    new_grid = grid.copy()
+    for i in range(1, grid.shape[0] - 1):
+        for j in range(1, grid.shape[1] - 1):
+            if grid[i, j] == BURNING:
+                # Probabilidad de recuperación (celda se vuelve quemada)
+                if draw(RECOVERY_SLOT, i, j) < gamma:
+                    new_grid[i, j] = BURNED
+                else:
+                    # Propagación del fuego a celdas vecinas
+                    for slot, (x, y) in zip(SPREAD_SLOTS, [(i-1, j), (i+1, j), (i, j-1), (i, j+1)]):
+                        if grid[x, y] == EMPTY and draw(slot, i, j) < beta:
+                            new_grid[x, y] = BURNING
+    return new_grid
+
+def update_grid_diffusion_loop(grid, diffusion_rate, wind_direction, wind_influence, rng=None):
+    draw = _loop_draw(rng)
+    new_grid = grid.copy()
+    for i in range(1, grid.shape[0] - 1):
+        for j in range(1, grid.shape[1] - 1):
+            if grid[i, j] == BURNING:
+                new_grid[i, j] = BURNED  # La celda se quema
+                for slot, (dx, dy) in zip(SPREAD_SLOTS, NEIGHBOURS):
+                    ni, nj = i + dx, j + dy
+                    if grid[ni, nj] == EMPTY:
+                        # Calcular probabilidad de difusión ajustada por viento
+                        diffusion_prob = diffusion_rate
+                        if (dx, dy) == wind_direction:
+                            diffusion_prob += wind_influence
+                        # Propagar el fuego basado en la tasa de difusión
+                        if draw(slot, i, j) < diffusion_prob:
+                            new_grid[ni, nj] = BURNING
+    return new_grid
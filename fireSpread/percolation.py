@@ -0,0 +1,107 @@
+import numpy as np
+
+from .kernels import NEIGHBOURS, diffusion_probs
+from .simulation import GRID_SIZE
+
+# Vía rápida por percolación para el tamaño final de los incendios del modelo
+# de difusión. Cada celda en llamas intenta encender a cada vecino una sola
+# vez y después se quema, así que cada arista dirigida (celda -> vecino) se
+# prueba como mucho una vez y la región quemada final es exactamente el
+# conjunto de celdas alcanzables desde el foco por aristas dirigidas
+# abiertas. Las aristas se sortean en bloque para muchas réplicas a la vez y
+# la alcanzabilidad se calcula expandiendo el frente de todas a la vez, sin
+# ejecutar el bucle de pasos ni recorrer la cuadrícula en cada nivel.
+#
+# Como las aristas conservan su dirección, el resultado es exacto también
+# con viento y con terreno heterogéneo. Como en los kernels, las celdas del
+# borde pueden encenderse pero no propagan (no tienen aristas de salida), así
+# que un foco en el borde solo quema su propia celda.
+
+# Memoria aproximada (bytes) de un bloque de réplicas cuando no se fija
+# batch_size: los sorteos de una dirección (float64), las aristas abiertas y
+# las celdas alcanzadas de cada foco
+BATCH_MEMORY = 256 * 2**20
+
+# Aristas abiertas (4, réplicas, H * W) de `batch` réplicas de los campos
+# dirigidos (4, H, W): open_edges[k, r, c] indica que la celda c de la
+# réplica r encendería a su vecino NEIGHBOURS[k] si ardiera. Los números se
+# piden dirección a dirección (la misma secuencia que un único bloque
+# (4, réplicas, H * W)), así que solo hay en memoria los de una dirección.
+def sample_open_edges(fields, batch, rng=None):
+    rng = np.random if rng is None else rng
+    height, width = fields.shape[1:]
+    interior = np.zeros((height, width), dtype=bool)
+    interior[1:-1, 1:-1] = True
+    probs = np.where(interior, fields, 0).reshape(4, 1, -1)
+    open_edges = np.empty((4, batch, height * width), dtype=bool)
+    for k in range(4):
+        open_edges[k] = rng.random((batch, height * width)) < probs[k]
+    return open_edges
+
+# Nodos alcanzables desde `sources` en un lote de grafos de cuadrícula
+# (índices planos sobre todos los grafos, cada uno de `width` columnas) por
+# las aristas abiertas `open_edges` (4, grafos, celdas). Con shared > 1 cada
+# conjunto de aristas lo comparten `shared` grafos consecutivos (p. ej. los
+# focos de una réplica), que lo indexan sin copiarlo. Solo el interior tiene
+# aristas de salida, así que los desplazamientos nunca cruzan de una fila o
+# un grafo a otro.
+def reachable(open_edges, sources, width, shared=1):
+    n_cells = open_edges.shape[-1]
+    open_edges = open_edges.reshape(4, -1)
+    offsets = [dx * width + dy for dx, dy in NEIGHBOURS]
+    reached = np.zeros(open_edges.shape[1] * shared, dtype=bool)
+    frontier = np.unique(sources)
+    reached[frontier] = True
+    while frontier.size:
+        edges = frontier if shared == 1 else frontier // (shared * n_cells) * n_cells + frontier % n_cells
+        targets = np.concatenate([frontier[open_edges[k, edges]] + offsets[k] for k in range(4)])
+        frontier = np.unique(targets[~reached[targets]])
+        reached[frontier] = True
+    return reached
+
+# Área quemada final (réplicas, focos) y probabilidad de quema de cada celda
+# para `num_replicas` réplicas de los campos dirigidos (4, H, W). `ignitions`
+# es una lista de focos (fila, columna) que se prueban en todas las réplicas
+# (cada foco con las mismas aristas, como incendios independientes); si no
+# se indica, cada réplica usa un foco aleatorio como initialize_grid. Las
+# réplicas se procesan en bloques de `batch_size`; por defecto, los que caben
+# en BATCH_MEMORY según el tamaño de la cuadrícula y el número de focos.
+def run_percolation(fields, num_replicas, ignitions=None, rng=None, batch_size=None):
+    rng = np.random if rng is None else rng
+    height, width = fields.shape[1:]
+    n_cells = height * width
+    if batch_size is None:
+        num_foci = 1 if ignitions is None else len(np.asarray(ignitions).reshape(-1, 2))
+        batch_size = max(1, BATCH_MEMORY // (n_cells * (8 + 4 + num_foci)))
+
+    areas, burn_counts = [], np.zeros(n_cells)
+    for start in range(0, num_replicas, batch_size):
+        batch = min(batch_size, num_replicas - start)
+        if ignitions is None:
+            cells = (rng.random((batch, 2)) * (height, width)).astype(int)
+            foci = (cells[:, 0] * width + cells[:, 1])[:, np.newaxis]
+        else:
+            cells = np.asarray(ignitions, dtype=int).reshape(-1, 2)
+            foci = np.broadcast_to(cells[:, 0] * width + cells[:, 1], (batch, len(cells)))
+
+        # Un grafo por (réplica, foco); los focos de una réplica comparten aristas
+        num_foci = foci.shape[1]
+        open_edges = sample_open_edges(fields, batch, rng)
+        offsets = np.arange(batch * num_foci).reshape(batch, num_foci) * n_cells
+        burned = reachable(open_edges, (foci + offsets).ravel(), width, num_foci).reshape(batch, num_foci, n_cells)
+        areas.append(burned.sum(axis=2))
+        burn_counts += burned.sum(axis=(0, 1))
+
+    areas = np.concatenate(areas)
+    return areas, (burn_counts / areas.size).reshape(height, width)
+
+# Percolación del modelo de difusión con viento de update_grid_diffusion
+def run_percolation_wind(diffusion_rate, wind_direction, wind_influence, num_replicas, grid_size=GRID_SIZE,
+                         ignitions=None, rng=None, batch_size=None):
+    probs = diffusion_probs(diffusion_rate, wind_direction, wind_influence)
+    fields = np.broadcast_to(probs[:, None, None], (4, grid_size, grid_size))
+    return run_percolation(fields, num_replicas, ignitions, rng, batch_size)
+
+# Distribución del área quemada final: probabilidad de cada área 0..n_cells
+def burned_area_distribution(areas, n_cells):
+    return np.bincount(np.ravel(areas), minlength=n_cells + 1) / np.size(areas)
@@ -0,0 +1,105 @@
+import os
+
+# Gráficos de resultados. matplotlib solo se importa al llamar a una de estas
+# funciones, de modo que importar el paquete no abre ventanas ni carga el
+# backend gráfico (los procesos de un barrido nunca llegan a importarlo).
+
+STATE_LABELS = ["Empty (Verde)", "Burning (En llamas)", "Burned (Quemado)"]
+
+def _pyplot():
+    import matplotlib.pyplot as plt
+    return plt
+
+# Guarda la figura en `path` (creando su directorio) y la muestra o la cierra
+def _finish(fig, path=None, show=False):
+    plt = _pyplot()
+    if path is not None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fig.savefig(path)
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+    return fig
+
+# Evolución de la cantidad de celdas en cada estado a lo largo del tiempo
+def plot_evolution(empty, burning, burned, title, path=None, show=False,
+                   ylabel="Cantidad de celdas", figsize=(10, 6)):
+    plt = _pyplot()
+    fig = plt.figure(figsize=figsize)
+    for values, label in zip((empty, burning, burned), STATE_LABELS):
+        plt.plot(values, label=label)
+    plt.xlabel("Iteración")
+    plt.ylabel(ylabel)
+    plt.title(title)
+    plt.legend()
+    return _finish(fig, path, show)
+
+# Evolución promedio de un resumen de run_simulations_with_averages(_wind)
+def plot_average_evolution(metrics, title, path=None, show=False):
+    return plot_evolution(metrics["avg_empty"], metrics["avg_burning"], metrics["avg_burned"],
+                          title, path, show, ylabel="Promedio de cantidad de celdas")
+
+# Barras de velocidad de propagación y tiempo de extinción por configuración
+def plot_comparative_metrics(metrics, labels, xlabel, path=None, show=False):
+    plt = _pyplot()
+    fig = plt.figure(figsize=(12, 6))
+    panels = [("spread_rate", "Velocidad de propagación"), ("extinction_time", "Tiempo de extinción")]
+    for i, (key, name) in enumerate(panels):
+        plt.subplot(1, 2, i + 1)
+        values = [m[key] for m in metrics]
+        plt.bar(range(len(values)), values, tick_label=labels)
+        plt.xlabel(xlabel)
+        plt.ylabel(name)
+        plt.title(f"Comparación de {name[0].lower()}{name[1:]}")
+    plt.tight_layout()
+    return _finish(fig, path, show)
+
+# Mapa de calor de un arreglo por celda (p. ej. burn_probability o
+# ignition_mean de fireSpread.spatial); las celdas NaN quedan en blanco
+def plot_heatmap(values, title, path=None, show=False, label=None, cmap="inferno"):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(7, 6))
+    image = ax.imshow(values, cmap=cmap, interpolation="nearest")
+    fig.colorbar(image, ax=ax, label=label)
+    ax.set_title(title)
+    ax.axis("off")
+    return _finish(fig, path, show)
+
+# Animación interactiva de una simulación: `step(grid, out, counters)` avanza
+# un paso. Los fotogramas salen de fireSpread.stream, así que la animación
+# marca el ritmo de la simulación y termina en cuanto el fuego se extingue.
+# Cada `capture_every` iteraciones se guarda una captura en `capture_dir`.
+# Devuelve las listas de conteos (empty, burning, burned) por iteración.
+def animate_simulation(grid, step, max_iter, capture_dir=None, capture_every=10):
+    import matplotlib.animation as animation
+
+    from .render import GridView
+    from .stream import CountsCollector, stream
+
+    plt = _pyplot()
+    if capture_dir is not None:
+        os.makedirs(capture_dir, exist_ok=True)
+
+    # Un único AxesImage que se actualiza con set_data
+    fig, ax = plt.subplots()
+    view = GridView(grid, ax)
+    collector = CountsCollector()
+
+    def animate(frame):
+        view.update(frame.grid, f"Iteración {frame.step+1}")
+
+        # Guardar captura cada `capture_every` iteraciones
+        if capture_dir is not None and (frame.step + 1) % capture_every == 0:
+            capture_path = os.path.join(capture_dir, f"frame_{frame.step+1}.png")
+            fig.savefig(capture_path, bbox_inches='tight')
+            print(f"Captura guardada en: {capture_path}")
+
+        collector(frame)
+
+    ani = animation.FuncAnimation(fig, animate, frames=stream(grid, step, max_iter), repeat=False,
+                                  cache_frame_data=False)
+    plt.show()
+    return collector.empty_counts, collector.burning_counts, collector.burned_counts
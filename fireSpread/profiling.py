@@ -0,0 +1,95 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+# Instrumentación por paso de las simulaciones. Un Profiler registra el tiempo
+# de pared de cada fase (conteo, kernel, graficado...) y de cada paso, junto
+# con los contadores que acumulan los kernels (celdas examinadas, números
+# aleatorios, igniciones, celdas apagadas) y el tamaño del frente. Cuando no
+# se pasa un Profiler los bucles usan `phase(None, ...)`, que no hace nada.
+
+_NO_PHASE = nullcontext()
+
+# Contexto de fase: mide con `profiler` o no hace nada si es None
+def phase(profiler, name):
+    return _NO_PHASE if profiler is None else profiler.phase(name)
+
+class Profiler:
+    def __init__(self):
+        self.events = []        # (nombre, paso, inicio, duración) en segundos
+        self.steps = []         # un dict por paso: tiempo, fases y contadores
+        self.counters = {}      # contadores del paso en curso (los rellenan los kernels)
+        self._origin = time.perf_counter()
+        self._step = None
+
+    def begin_step(self, step):
+        self._step = {"step": step, "start": time.perf_counter(), "phases": {}}
+        self.counters = {}
+
+    def end_step(self, **values):
+        record = self._step
+        end = time.perf_counter()
+        record["seconds"] = end - record.pop("start")
+        # Tiempo del paso que no cae en ninguna fase medida (sobrecarga de Python)
+        record["phases"]["overhead"] = record["seconds"] - sum(record["phases"].values())
+        record.update(self.counters, **values)
+        self.steps.append(record)
+        self.events.append(("step", record["step"], end - record["seconds"] - self._origin, record["seconds"]))
+        self._step = None
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            step = None
+            if self._step is not None:
+                step = self._step["step"]
+                phases = self._step["phases"]
+                phases[name] = phases.get(name, 0.0) + duration
+            self.events.append((name, step, start - self._origin, duration))
+
+    # Resumen: totales por fase y por contador, y el detalle de cada paso
+    def report(self):
+        phases, counters = {}, {}
+        for record in self.steps:
+            for name, seconds in record["phases"].items():
+                total = phases.setdefault(name, {"seconds": 0.0, "calls": 0})
+                total["seconds"] += seconds
+                total["calls"] += 1
+            for name, value in record.items():
+                if name not in ("step", "seconds", "phases"):
+                    counters[name] = counters.get(name, 0) + value
+        return {
+            "steps": len(self.steps),
+            "seconds": sum(record["seconds"] for record in self.steps),
+            "phases": phases,
+            "counters": counters,
+            "per_step": self.steps,
+        }
+
+    def to_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    # Línea de tiempo en formato Chrome trace (chrome://tracing, Perfetto):
+    # un evento "X" por paso y fase y un contador "C" por paso
+    def chrome_trace(self):
+        events = []
+        for name, step, start, duration in self.events:
+            events.append({"name": name, "ph": "X", "pid": 0, "tid": 0 if name == "step" else 1,
+                           "ts": start * 1e6, "dur": duration * 1e6,
+                           "args": {} if step is None else {"step": step}})
+        step_starts = {step: start for name, step, start, _ in self.events if name == "step"}
+        for record in self.steps:
+            args = {name: value for name, value in record.items()
+                    if name not in ("step", "seconds", "phases")}
+            events.append({"name": "counters", "ph": "C", "pid": 0, "tid": 0,
+                           "ts": step_starts[record["step"]] * 1e6, "args": args})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_chrome_trace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
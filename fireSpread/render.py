@@ -0,0 +1,126 @@
+import os
+import queue
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+from .kernels import GRID_DTYPE
+from .stream import stream
+
+# Renderizado sin interfaz gráfica: los estados se convierten directamente en
+# imágenes de paleta con una tabla de colores precalculada, sin pasar por
+# matplotlib, y los fotogramas se escriben desde un hilo en segundo plano.
+
+# Colores por estado: verde (EMPTY), rojo (BURNING), negro (BURNED)
+COLORS = ['green', 'red', 'black']
+PALETTE = np.array([[0, 128, 0], [255, 0, 0], [0, 0, 0]], dtype=np.uint8)
+
+# Imagen RGB (H, W, 3) de una cuadrícula
+def to_rgb(grid):
+    return PALETTE[grid]
+
+def _png_chunk(kind, data):
+    chunk = kind + data
+    return struct.pack(">I", len(data)) + chunk + struct.pack(">I", zlib.crc32(chunk) & 0xffffffff)
+
+# Codifica la cuadrícula como PNG de paleta de 8 bits (un byte por celda);
+# `scale` repite cada celda en bloques de scale x scale píxeles
+def encode_png(grid, scale=1, level=1):
+    pixels = np.asarray(grid, dtype=GRID_DTYPE)
+    if scale > 1:
+        pixels = pixels.repeat(scale, axis=0).repeat(scale, axis=1)
+    height, width = pixels.shape
+    rows = np.zeros((height, width + 1), dtype=np.uint8)  # byte de filtro 0 por fila
+    rows[:, 1:] = pixels
+    header = struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"PLTE", PALETTE.tobytes())
+            + _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), level))
+            + _png_chunk(b"IEND", b""))
+
+def write_png(path, grid, scale=1):
+    with open(path, "wb") as f:
+        f.write(encode_png(grid, scale))
+
+# Escritor de fotogramas en segundo plano. La cola es acotada: si el disco no
+# da abasto, `submit` espera en lugar de acumular fotogramas en memoria.
+class FrameWriter:
+    def __init__(self, directory, scale=1, max_pending=8, pattern="frame_{step}.png"):
+        self.directory = directory
+        self.scale = scale
+        self.pattern = pattern
+        self.written = 0
+        self._queue = queue.Queue(max_pending)
+        self._error = None
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    # Encola la cuadrícula del paso `step`; se copia porque los buffers de la
+    # simulación se reutilizan en el paso siguiente
+    def submit(self, step, grid):
+        if self._error is not None:
+            raise self._error
+        self._queue.put((step, np.array(grid, dtype=GRID_DTYPE, copy=True)))
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            step, grid = item
+            try:
+                write_png(os.path.join(self.directory, self.pattern.format(step=step)), grid, self.scale)
+                self.written += 1
+            except Exception as error:
+                self._error = error
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Vista de matplotlib que reutiliza un único AxesImage (set_data) en lugar
+# de limpiar los ejes y volver a llamar a imshow en cada fotograma
+class GridView:
+    def __init__(self, grid, ax=None):
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import ListedColormap
+
+        if ax is None:
+            _, ax = plt.subplots()
+        self.ax = ax
+        self.figure = ax.figure
+        self.image = ax.imshow(grid, cmap=ListedColormap(COLORS), vmin=0, vmax=2)
+        ax.axis('off')
+
+    def update(self, grid, title=None):
+        self.image.set_data(grid)
+        if title is not None:
+            self.ax.set_title(title)
+        return self.image
+
+    def save(self, path, **kwargs):
+        self.figure.savefig(path, **kwargs)
+
+# Exporta todos los fotogramas (o uno de cada `every`) de una simulación sin
+# interfaz. Los fotogramas salen de fireSpread.stream: `step(grid, out,
+# counters)` avanza un paso in situ sobre una copia de `grid`, un CounterRNG
+# en `rng` se avanza tras cada paso y la exportación termina en cuanto el
+# fuego se extingue. Devuelve la cuadrícula del último fotograma.
+def export_frames(directory, grid, step, max_iter, every=1, scale=1, rng=None):
+    frame = None
+    with FrameWriter(directory, scale) as writer:
+        for frame in stream(grid, step, max_iter, rng=rng):
+            if frame.step % every == 0:
+                writer.submit(frame.step, frame.grid)
+    return np.array(frame.grid) if frame is not None else np.array(grid)
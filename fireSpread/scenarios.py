@@ -0,0 +1,191 @@
+import argparse
+import csv
+import json
+import re
+import sys
+
+import numpy as np
+
+from .cache import ResultCache
+from .kernels import BURNING, BURNED, EMPTY
+from .simulation import GRID_SIZE, ITERATIONS
+from .store import ResultStore
+from .sweep import MODELS, _config_results, _store
+
+# Lotes de escenarios desde archivos JSON o CSV y resultados por réplica en
+# un ResultStore. Cada escenario es un dict con el modelo ("sir", "wind" o
+# "terrain"), sus parámetros y, opcionalmente, grid_size, num_simulations,
+# name y los focos `ignitions` [(fila, columna), ...].
+#
+#   JSON  [{"model": "sir", "beta": 0.5, "gamma": 0.2, "ignitions": [[10, 10], [30, 40]]}, ...]
+#         o {"defaults": {...}, "scenarios": [...]}
+#   CSV   model,beta,gamma,diffusion_rate,wind_direction,wind_influence,grid_size,ignitions
+#         sir,0.5,0.2,,,,50,"10 10; 30 40"
+#         wind,,,0.5,"0 1",0.1,50,
+#
+#   python -m fireSpread.scenarios run escenarios.csv resultados/ --replicas 50
+#   python -m fireSpread.scenarios summary resultados/ --by model beta gamma --value final_burned
+
+# Columnas que no son parámetros del modelo
+RESERVED = ("model", "name", "num_simulations")
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() and re.fullmatch(r"[-+]?\d+", text.strip()) else value
+
+def _numbers(text):
+    return [_number(token) for token in re.findall(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?", text)]
+
+# Normaliza un escenario: dirección del viento como tupla (los kernels la
+# comparan con los desplazamientos de NEIGHBOURS) y focos como pares enteros
+def _normalize(scenario):
+    scenario = dict(scenario)
+    scenario.setdefault("model", "sir")
+    if scenario["model"] not in MODELS:
+        raise ValueError(f"Modelo desconocido: {scenario['model']!r} (opciones: {', '.join(MODELS)})")
+    if "wind_direction" in scenario:
+        scenario["wind_direction"] = tuple(scenario["wind_direction"])
+    if scenario.get("ignitions") is not None:
+        scenario["ignitions"] = [tuple(int(v) for v in point) for point in scenario["ignitions"]]
+    return scenario
+
+def _from_csv_row(row):
+    scenario = {}
+    for name, text in row.items():
+        text = (text or "").strip()
+        if not text:
+            continue
+        if name == "ignitions":
+            scenario[name] = [_numbers(point) for point in text.split(";") if point.strip()]
+        elif name == "wind_direction":
+            scenario[name] = _numbers(text)
+        elif name in ("model", "name"):
+            scenario[name] = text
+        else:
+            scenario[name] = _number(text)
+    return scenario
+
+# Lee una lista de escenarios de un archivo .json o .csv
+def load_scenarios(path):
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            scenarios = [_from_csv_row(row) for row in csv.DictReader(f)]
+    else:
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            defaults = data.get("defaults", {})
+            scenarios = [{**defaults, **scenario} for scenario in data["scenarios"]]
+        else:
+            scenarios = data
+    return [_normalize(scenario) for scenario in scenarios]
+
+# Columnas de parámetros de un escenario: escalares tal cual, vectores como
+# nombre_0, nombre_1... y el número de focos (uno aleatorio si no se indican;
+# los mapas de terreno se omiten)
+def _parameter_columns(sim):
+    ignitions = sim.get("ignitions")
+    columns = {"num_ignitions": 1 if ignitions is None else len(ignitions)}
+    for name, value in sim.items():
+        if name == "ignitions":
+            continue
+        if isinstance(value, (tuple, list)):
+            columns.update({f"{name}_{i}": v for i, v in enumerate(value)})
+        elif isinstance(value, (int, float, str, np.number)):
+            columns[name] = value
+    return columns
+
+# Columnas finales por réplica (EMPTY y BURNED al final, pico de BURNING y
+# métricas) de una entrada empaquetada (conteos, métricas) como las de la caché
+def _packed_columns(counts, metrics):
+    return {"spread_rate": metrics[0], "extinction_time": metrics[1], "final_empty": counts[EMPTY, :, -1],
+            "final_burned": counts[BURNED, :, -1], "peak_burning": counts[BURNING].max(axis=1)}
+
+# Las mismas columnas a partir de los resultados de run_simulation a medida
+# que llegan, sin guardar las curvas
+def _run_columns(runs):
+    columns = {"spread_rate": [], "extinction_time": [], "final_empty": [], "final_burned": [],
+               "peak_burning": []}
+    for empty, burning, burned, spread_rate, extinction_time in runs:
+        columns["spread_rate"].append(spread_rate)
+        columns["extinction_time"].append(extinction_time)
+        columns["final_empty"].append(empty[-1])
+        columns["final_burned"].append(burned[-1])
+        columns["peak_burning"].append(max(burning))
+    return {name: np.array(values) for name, values in columns.items()}
+
+# Ejecuta los escenarios (agrupados por modelo y número de réplicas, cada
+# uno con la semilla de su posición en la lista) y añade una fila por réplica
+# al `store`, configuración a configuración: de cada réplica solo se guardan
+# los valores finales, así que la memoria no depende de max_iter ni del
+# número de escenarios (las curvas completas solo se empaquetan para
+# escribirlas en la `cache`). Devuelve el número de filas escritas.
+def run_scenarios(scenarios, store, num_simulations=50, master_seed=0, max_iter=ITERATIONS,
+                  grid_size=GRID_SIZE, workers=None, cache=None):
+    groups = {}
+    for index, scenario in enumerate(scenarios):
+        key = (scenario["model"], scenario.get("num_simulations", num_simulations))
+        groups.setdefault(key, []).append(index)
+
+    rows = 0
+    for (model, replicas), indices in groups.items():
+        sims = [{k: v for k, v in scenarios[i].items() if k not in RESERVED} for i in indices]
+        results = _config_results(sims, replicas, model, master_seed, max_iter, grid_size, workers, cache,
+                                  config_indices=indices)
+        for index, sim, size, entry, start, runs in results:
+            if cache is None or master_seed is None:  # Sin caché (ver sweep._config_results)
+                columns = _run_columns(runs)
+            else:
+                runs = list(runs)
+                if runs:
+                    entry = _store(cache, model, sim, size, max_iter, master_seed, index, entry, start, runs)
+                columns = _packed_columns(entry[0][:, :replicas], entry[1][:, :replicas])
+            store.append({
+                "scenario": index,
+                "name": scenarios[index].get("name", ""),
+                "model": model,
+                "grid_size": size,
+                **_parameter_columns(sim),
+                "replica": np.arange(replicas),
+                **columns,
+            })
+            rows += replicas
+    store.flush()
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m fireSpread.scenarios")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Ejecuta un archivo de escenarios y guarda los resultados")
+    run.add_argument("scenarios", help="Archivo .json o .csv")
+    run.add_argument("store", help="Directorio del almacén de resultados")
+    run.add_argument("--replicas", type=int, default=50)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--max-iter", type=int, default=ITERATIONS)
+    run.add_argument("--grid-size", type=int, default=GRID_SIZE)
+    run.add_argument("--workers", type=int)
+    run.add_argument("--cache", action="store_true", help="Reutiliza resultados de la caché en disco")
+    summary = commands.add_parser("summary", help="Agrega una columna del almacén por grupos")
+    summary.add_argument("store")
+    summary.add_argument("--by", nargs="+", default=["scenario"])
+    summary.add_argument("--value", default="final_burned")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        cache = ResultCache() if args.cache else None
+        scenarios = load_scenarios(args.scenarios)
+        rows = run_scenarios(scenarios, ResultStore(args.store), args.replicas, args.seed, args.max_iter,
+                             args.grid_size, args.workers, cache)
+        print(f"{len(scenarios)} escenarios, {rows} filas añadidas a {args.store}")
+        return 0
+
+    groups = ResultStore(args.store).aggregate(args.by, args.value)
+    print("  ".join(args.by + ["count", "mean", "std", "min", "max"]))
+    for i in range(len(groups["count"])):
+        keys = [str(groups[name][i]) for name in args.by]
+        stats = [f"{groups[name][i]:.4g}" for name in ("count", "mean", "std", "min", "max")]
+        print("  ".join(keys + stats))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+import numpy as np
+
+from .counterrng import CounterRNG, advance, for_replica
+from .ensemble import initialize_ensemble, run_ensemble_counts
+from .front import front_stepper, update_front, update_front_diffusion, update_front_terrain
+from .kernels import (
+    BURNING, GRID_DTYPE, count_states, fire_is_out, update_counts,
+    update_grid, update_grid_diffusion, update_grid_terrain,
+)
+from .profiling import phase
+from .stats import EnsembleStatistics
+from .terrain import cached_spread_probability_fields, spread_probability_fields
+
+# Parámetros por defecto de la simulación
+GRID_SIZE = 50          # Tamaño de la cuadrícula
+ITERATIONS = 100        # Número de iteraciones
+
+# Motores de paso: "grid" recorre toda la cuadrícula en cada paso y "front"
+# solo las celdas en llamas y sus vecinos (fireSpread.front), mucho más
+# rápido en dominios grandes casi sin quemar. Con un CounterRNG ambos dan el
+# mismo resultado bit a bit; con otros generadores los números se piden en
+# otro orden y coinciden solo en distribución.
+ENGINES = ("grid", "front")
+
+# Modelos disponibles: "sir" (beta/gamma), "wind" (difusión con viento) y
+# "terrain" (difusión con vegetación, viento proyectado y pendiente)
+MODELS = ("sir", "wind", "terrain")
+
+# Todas las funciones aceptan un generador `rng` opcional (np.random.Generator
+# o RandomState); por defecto se usa el estado global de np.random.
+
+# Enciende los focos (fila, columna) indicados o, si no se indican, un foco
+# aleatorio
+def _ignite(grid, rng, ignitions):
+    if ignitions is None:
+        start_x, start_y = (rng.random(2) * grid.shape[0]).astype(int)
+        grid[start_x, start_y] = BURNING
+    else:
+        rows, cols = np.asarray(ignitions, dtype=int).reshape(-1, 2).T
+        grid[rows, cols] = BURNING
+    return grid
+
+# Inicialización de la cuadrícula con un foco aleatorio o con los focos
+# (fila, columna) de `ignitions`
+def initialize_grid(size, rng=None, ignitions=None):
+    rng = np.random if rng is None else rng
+    grid = np.zeros((size, size), dtype=GRID_DTYPE)
+    return _ignite(grid, rng, ignitions)
+
+# Inicialización de la cuadrícula y vegetación
+def initialize_grid_wind(size, rng=None, ignitions=None):
+    rng = np.random if rng is None else rng
+    grid = np.zeros((size, size), dtype=GRID_DTYPE)
+    vegetation = rng.random((size, size))  # Densidad de vegetación (0-1)
+    return _ignite(grid, rng, ignitions), vegetation
+
+# Función de paso step(grid, out, counters) del motor `engine`: `kernel`
+# (grid, *params, rng, out, counters) es el kernel de cuadrícula completa y
+# `front_kernel` (grid, front, *params, rng, counters) su versión de frente
+def _stepper(engine, grid, kernel, front_kernel, params, rng):
+    if engine == "grid":
+        return lambda g, out, counters: kernel(g, *params, rng, out, counters)
+    if engine == "front":
+        return front_stepper(grid, lambda g, front, counters: front_kernel(g, front, *params, rng, counters))
+    raise ValueError(f"Motor desconocido: {engine!r} (opciones: {', '.join(ENGINES)})")
+
+# Bucle común: avanza la cuadrícula in situ con `step(grid, out, counters)`
+# (out=grid) y calcula las métricas. Los conteos se
+# obtienen una sola vez y después se mantienen con las transiciones que
+# registran los kernels. Con un `profiler` se miden las fases de cada paso;
+# un CounterRNG en `rng` se avanza un paso tras cada actualización.
+def _run(step, grid, max_iter, profiler=None, rng=None):
+    counts = count_states(grid)
+    empty_counts, burning_counts, burned_counts = [], [], []
+    for i in range(max_iter):
+        if profiler is not None:
+            profiler.begin_step(i)
+
+        empty, burning, burned = counts
+        empty_counts.append(empty)
+        burning_counts.append(burning)
+        burned_counts.append(burned)
+
+        # Terminar si no hay celdas en llamas (extinción)
+        if fire_is_out(counts):
+            if profiler is not None:
+                profiler.end_step(front_size=0)
+            break
+
+        counters = {} if profiler is None else profiler.counters
+        with phase(profiler, "kernel"):
+            grid = step(grid, grid, counters)
+        advance(rng)
+        update_counts(counts, counters)
+        if profiler is not None:
+            profiler.end_step(front_size=int(burning))
+
+    # Calcular velocidad de propagación y tiempo de extinción
+    burned_area = np.sum(burned_counts)
+    spread_rate = burned_area / i if i > 0 else 0
+    extinction_time = i
+
+    return empty_counts, burning_counts, burned_counts, spread_rate, extinction_time
+
+# Cuadrícula inicial y función de paso step(grid, out, counters) de una
+# réplica del modelo `model` con los parámetros `sim` (dict como en los
+# barridos: beta y gamma; diffusion_rate, wind_direction y wind_influence; en
+# "terrain" además vegetation, vegetation_weight, elevation y slope_factor; y
+# los focos opcionales `ignitions`). Todos los motores y ejecutores parten de
+# aquí, así que una réplica consume el generador siempre en el mismo orden.
+def model_step(model, sim, grid_size, rng=None, engine="grid"):
+    if model == "sir":
+        grid = initialize_grid(grid_size, rng, sim.get("ignitions"))
+        return grid, _stepper(engine, grid, update_grid, update_front, (sim["beta"], sim["gamma"]), rng)
+    if model not in MODELS:
+        raise ValueError(f"Modelo desconocido: {model!r} (opciones: {', '.join(MODELS)})")
+    grid, vegetation = initialize_grid_wind(grid_size, rng, sim.get("ignitions"))
+    wind = (sim["diffusion_rate"], sim["wind_direction"], sim["wind_influence"])
+    if model == "wind":
+        return grid, _stepper(engine, grid, update_grid_diffusion, update_front_diffusion, wind, rng)
+    # Con un mapa de vegetación fijo los campos se reutilizan entre réplicas
+    # desde la caché; sin él se usa la densidad aleatoria de la réplica
+    terrain = (sim.get("vegetation_weight", 1.0), sim.get("elevation"), sim.get("slope_factor", 0.0))
+    if sim.get("vegetation") is None:
+        fields = spread_probability_fields(grid.shape, *wind, vegetation, *terrain)
+    else:
+        fields = cached_spread_probability_fields(grid.shape, *wind, sim["vegetation"], *terrain)
+    return grid, _stepper(engine, grid, update_grid_terrain, update_front_terrain, (fields,), rng)
+
+# Ejecuta una réplica de `model` (ver model_step) y calcula sus métricas
+def run_model(model, sim, grid_size, max_iter=ITERATIONS, rng=None, profiler=None, engine="grid"):
+    grid, step = model_step(model, sim, grid_size, rng, engine)
+    return _run(step, grid, max_iter, profiler, rng)
+
+# Función para ejecutar una simulación SIR (beta/gamma) y calcular métricas
+def run_simulation(beta, gamma, grid_size, max_iter=ITERATIONS, rng=None, profiler=None, ignitions=None,
+                   engine="grid"):
+    sim = {"beta": beta, "gamma": gamma, "ignitions": ignitions}
+    return run_model("sir", sim, grid_size, max_iter, rng, profiler, engine)
+
+# Función para ejecutar una simulación de difusión con viento y calcular métricas
+def run_simulation_wind(diffusion_rate, wind_direction, wind_influence, grid_size,
+                        max_iter=ITERATIONS, rng=None, profiler=None, ignitions=None, engine="grid"):
+    sim = {"diffusion_rate": diffusion_rate, "wind_direction": wind_direction,
+           "wind_influence": wind_influence, "ignitions": ignitions}
+    return run_model("wind", sim, grid_size, max_iter, rng, profiler, engine)
+
+# Simulación de difusión sobre terreno heterogéneo: vegetación, proyección
+# del viento y pendiente opcional (ver fireSpread.terrain). Si no se pasa
+# `vegetation` se usa la densidad aleatoria de la réplica; con un mapa fijo
+# los campos de probabilidad se reutilizan entre réplicas desde la caché.
+def run_simulation_terrain(diffusion_rate, wind_direction, wind_influence, grid_size,
+                           max_iter=ITERATIONS, rng=None, vegetation=None, vegetation_weight=1.0,
+                           elevation=None, slope_factor=0.0, profiler=None, ignitions=None, engine="grid"):
+    sim = {"diffusion_rate": diffusion_rate, "wind_direction": wind_direction, "wind_influence": wind_influence,
+           "vegetation": vegetation, "vegetation_weight": vegetation_weight, "elevation": elevation,
+           "slope_factor": slope_factor, "ignitions": ignitions}
+    return run_model("terrain", sim, grid_size, max_iter, rng, profiler, engine)
+
+# Acumula num_simulations réplicas de `model` (ver model_step) en
+# estadísticas en línea: en lote con `step` sobre un arreglo (réplicas, H, W)
+# o una a una. Con un CounterRNG la réplica r usa for_replica(rng, r) en ambos
+# modos (focos incluidos), así que el resultado no depende de `batched`; con
+# otros generadores los números se piden en otro orden y los dos modos
+# coinciden solo en distribución.
+def _ensemble_statistics(model, sim, step, grid_size, num_simulations, max_iter, batched, rng):
+    stats = EnsembleStatistics(max_iter, grid_size * grid_size)
+    if not batched:
+        for r in range(num_simulations):
+            stats.add_run(*run_model(model, sim, grid_size, max_iter, for_replica(rng, r)))
+        return stats
+    # Modo por lotes: todas las réplicas avanzan juntas en un solo arreglo
+    if isinstance(rng, CounterRNG):
+        grids = np.stack([model_step(model, sim, grid_size, for_replica(rng, r))[0]
+                          for r in range(num_simulations)])
+        rng = for_replica(rng, 0)
+    else:
+        grids = initialize_ensemble(num_simulations, grid_size, rng)
+    stats.add_counts(run_ensemble_counts(step, grids, max_iter, rng))
+    return stats
+
+# Ejecutar simulaciones SIR múltiples y calcular promedios
+def run_simulations_with_averages(simulations, num_simulations, max_iter=ITERATIONS,
+                                  batched=False, rng=None):
+    averaged_metrics = []
+    for sim in simulations:
+        beta, gamma, grid_size = sim["beta"], sim["gamma"], sim["grid_size"]
+        stats = _ensemble_statistics(
+            "sir", {"beta": beta, "gamma": gamma},
+            lambda g, out, r, counters: update_grid(g, beta, gamma, r, out, counters),
+            grid_size, num_simulations, max_iter, batched, rng
+        )
+
+        averaged_metrics.append({
+            "beta": beta,
+            "gamma": gamma,
+            **stats.summary()
+        })
+
+    return averaged_metrics
+
+# Ejecutar simulaciones con viento múltiples y calcular promedios
+def run_simulations_with_averages_wind(simulations, num_simulations, max_iter=ITERATIONS,
+                                       grid_size=GRID_SIZE, batched=False, rng=None):
+    averaged_metrics = []
+    for sim in simulations:
+        diffusion_rate = sim["diffusion_rate"]
+        wind_direction = sim["wind_direction"]
+        wind_influence = sim["wind_influence"]
+        size = sim.get("grid_size", grid_size)
+
+        stats = _ensemble_statistics(
+            "wind", sim,
+            lambda g, out, r, counters: update_grid_diffusion(g, diffusion_rate, wind_direction, wind_influence,
+                                                              r, out, counters),
+            size, num_simulations, max_iter, batched, rng
+        )
+
+        averaged_metrics.append({
+            "diffusion_rate": diffusion_rate,
+            "wind_direction": wind_direction,
+            "wind_influence": wind_influence,
+            **stats.summary()
+        })
+
+    return averaged_metrics
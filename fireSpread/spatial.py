@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+
+from .atomic import save_npz
+from .kernels import BURNING
+from .simulation import GRID_SIZE, ITERATIONS, MODELS, model_step
+from .stream import stream
+from .sweep import ordered_map, replica_seed
+
+# Mapas espaciales de un ensamble acumulados en línea: cuántas réplicas
+# queman cada celda y la media y varianza (Welford/Chan por celda) del paso en
+# que se enciende. La memoria son tres cuadrículas sin importar el número de
+# réplicas, y dos acumuladores se pueden fusionar (p. ej. entre procesos).
+#
+# El paso de ignición de una réplica es un mapa (H, W) con el primer paso en
+# que la celda aparece en llamas (0 para los focos) y un valor negativo o inf
+# si nunca se enciende, como los tiempos de llegada de fireSpread.arrival.
+class SpatialStats:
+    def __init__(self, shape):
+        self.shape = tuple(shape)
+        self.count = 0
+        self.burn_count = np.zeros(self.shape, dtype=np.int64)
+        self.mean = np.zeros(self.shape)
+        self.m2 = np.zeros(self.shape)
+
+    # Añade el mapa de ignición de una réplica
+    def update(self, ignition):
+        self.update_many(np.asarray(ignition, dtype=float)[np.newaxis])
+
+    # Añade varios mapas apilados en el primer eje (réplicas, H, W)
+    def update_many(self, ignitions):
+        ignitions = np.asarray(ignitions, dtype=float)
+        burned = np.isfinite(ignitions) & (ignitions >= 0)
+        batch = SpatialStats(self.shape)
+        batch.count = ignitions.shape[0]
+        batch.burn_count = burned.sum(axis=0)
+        values = np.where(burned, ignitions, 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            batch.mean = np.where(batch.burn_count > 0, values.sum(axis=0) / batch.burn_count, 0)
+        batch.m2 = np.where(burned, (values - batch.mean) ** 2, 0).sum(axis=0)
+        return self.merge(batch)
+
+    # Fusiona otro acumulador de la misma forma
+    def merge(self, other):
+        total = self.burn_count + other.burn_count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(total > 0, other.burn_count / total, 0)
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.burn_count * weight
+        self.burn_count = total
+        self.count += other.count
+        return self
+
+    # Fracción de réplicas en que se quema cada celda
+    @property
+    def burn_probability(self):
+        return self.burn_count / max(self.count, 1)
+
+    # Media del paso de ignición (NaN en celdas que nunca se queman)
+    @property
+    def ignition_mean(self):
+        return np.where(self.burn_count > 0, self.mean, np.nan)
+
+    # Varianza muestral del paso de ignición (NaN con menos de dos réplicas)
+    @property
+    def ignition_variance(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.burn_count > 1, self.m2 / (self.burn_count - 1), np.nan)
+
+    def summary(self):
+        return {"num_simulations": self.count, "burn_probability": self.burn_probability,
+                "ignition_mean": self.ignition_mean, "ignition_var": self.ignition_variance}
+
+    # Guarda el acumulador de forma atómica (como np.savez, añade .npz si falta)
+    def save(self, path):
+        path = os.fspath(path)
+        path = path if path.endswith(".npz") else path + ".npz"
+        save_npz(path, {"count": self.count, "burn_count": self.burn_count, "mean": self.mean, "m2": self.m2})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            stats = cls(data["burn_count"].shape)
+            stats.count = int(data["count"])
+            stats.burn_count, stats.mean, stats.m2 = data["burn_count"], data["mean"], data["m2"]
+        return stats
+
+# Mapa de ignición de una simulación recorriendo sus fotogramas (ver
+# fireSpread.stream): -1 en las celdas que no llegan a encenderse
+def ignition_steps(frames, shape):
+    ignition = np.full(shape, -1, dtype=np.int32)
+    for frame in frames:
+        ignited = (frame.grid == BURNING) & (ignition < 0)
+        ignition[ignited] = frame.step
+    return ignition
+
+# Acumula las réplicas [first, last) de una configuración
+def _run_chunk(job):
+    model, sim, master_seed, config_index, first, last, max_iter, grid_size = job
+    size = sim.get("grid_size", grid_size)
+    stats = SpatialStats((size, size))
+    for replica in range(first, last):
+        rng = np.random.default_rng(replica_seed(master_seed, config_index, replica))
+        grid, step = model_step(model, sim, size, rng)
+        stats.update(ignition_steps(stream(grid, step, max_iter), grid.shape))
+    return stats
+
+# Mapas espaciales por configuración con las mismas semillas por réplica que
+# run_sweep. Las réplicas se reparten en bloques de `chunk_size` entre
+# `workers` procesos (workers=1 en el proceso actual) y cada bloque se
+# fusiona en el acumulador de su configuración en cuanto llega, siempre en
+# el orden de los bloques: el resultado no depende de `workers` y la memoria
+# es la de unos pocos acumuladores (dos por proceso) sin importar el número
+# de réplicas. Devuelve por configuración sus parámetros más
+# SpatialStats.summary().
+def run_spatial_sweep(simulations, num_simulations, model="sir", master_seed=0, max_iter=ITERATIONS,
+                      grid_size=GRID_SIZE, workers=None, chunk_size=16):
+    if model not in MODELS:
+        raise ValueError(f"Modelo desconocido: {model!r} (opciones: {', '.join(MODELS)})")
+    workers = workers or os.cpu_count() or 1
+    jobs = [(model, sim, master_seed, c, first, min(first + chunk_size, num_simulations), max_iter, grid_size)
+            for c, sim in enumerate(simulations) for first in range(0, num_simulations, chunk_size)]
+    chunks = ordered_map(_run_chunk, jobs, workers, 2 * workers)
+
+    spatial_maps = []
+    for sim in simulations:
+        size = sim.get("grid_size", grid_size)
+        stats = SpatialStats((size, size))
+        for _ in range(0, num_simulations, chunk_size):
+            stats.merge(next(chunks))
+        spatial_maps.append({**sim, **stats.summary()})
+    return spatial_maps
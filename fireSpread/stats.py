@@ -0,0 +1,158 @@
+from statistics import NormalDist
+
+import numpy as np
+
+from .kernels import EMPTY, BURNING, BURNED
+
+# Estadísticas en línea: media y varianza (Welford/Chan) más un histograma
+# logarítmico para los cuantiles (como DDSketch): el bin k cubre
+# (resolution * gamma^(k-1), resolution * gamma^k], así que cualquier cuantil
+# se obtiene con un error relativo de a lo sumo `relative_accuracy` sea cual
+# sea la escala de los datos dentro de `value_range`, y los valores por debajo
+# de `resolution` (por defecto una millonésima del máximo) cuentan como 0.
+# Pensado para valores no negativos. La memoria es constante en el número de
+# réplicas y dos acumuladores se pueden fusionar (p. ej. entre procesos).
+class RunningStats:
+    def __init__(self, shape=(), value_range=(0.0, 1.0), relative_accuracy=0.01, resolution=None):
+        self.shape = tuple(shape)
+        self.value_range = (float(value_range[0]), float(value_range[1]))
+        self.relative_accuracy = relative_accuracy
+        high = max(self.value_range[1], np.finfo(float).tiny)
+        self.resolution = float(high * 1e-6 if resolution is None else resolution)
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.bins = int(np.ceil(np.log(max(high / self.resolution, 1)) / np.log(self.gamma))) + 2
+        self.count = 0
+        self.mean = np.zeros(self.shape)
+        self.m2 = np.zeros(self.shape)
+        self.histogram = np.zeros(self.shape + (self.bins,), dtype=np.int64)
+
+    # Añade una observación con forma `shape`
+    def update(self, value):
+        self.update_many(np.asarray(value, dtype=float)[np.newaxis])
+
+    # Añade varias observaciones apiladas en el primer eje
+    def update_many(self, values):
+        values = np.asarray(values, dtype=float)
+        batch = RunningStats(self.shape, self.value_range, self.relative_accuracy, self.resolution)
+        batch.count = values.shape[0]
+        batch.mean = values.mean(axis=0)
+        batch.m2 = ((values - batch.mean) ** 2).sum(axis=0)
+        index = self._index(values).reshape(batch.count, -1)
+        cells = np.arange(index.shape[1]) * self.bins
+        batch.histogram = np.bincount((cells + index).ravel(), minlength=cells.size * self.bins)
+        batch.histogram = batch.histogram.reshape(self.shape + (self.bins,))
+        self.merge(batch)
+
+    # Bin de cada valor: 0 para los menores que `resolution`
+    def _index(self, values):
+        scaled = np.maximum(values, self.resolution) / self.resolution
+        index = np.ceil(np.log(scaled) / np.log(self.gamma)).astype(int) + 1
+        return np.clip(np.where(values < self.resolution, 0, index), 0, self.bins - 1)
+
+    # Fusiona otro acumulador con la misma configuración
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / total
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / total
+        self.histogram += other.histogram
+        self.count = total
+        return self
+
+    @property
+    def variance(self):
+        if self.count < 2:
+            return np.zeros(self.shape)
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    # Intervalo de confianza normal para la media: (inferior, superior)
+    def confidence_interval(self, level=0.95):
+        half = self.half_width(level)
+        return self.mean - half, self.mean + half
+
+    # Semiancho del intervalo de confianza de la media
+    def half_width(self, level=0.95):
+        if self.count == 0:
+            return np.full(self.shape, np.inf)
+        z = NormalDist().inv_cdf(0.5 + level / 2)
+        return z * self.std / np.sqrt(self.count)
+
+    # Cuantil con error relativo <= relative_accuracy: el valor representativo
+    # del bin que contiene el rango q * (count - 1)
+    def quantile(self, q):
+        cumulative = self.histogram.cumsum(axis=-1)
+        index = np.argmax(cumulative > q * max(self.count - 1, 0), axis=-1)
+        value = self.resolution * 2 * self.gamma ** (index - 1.0) / (self.gamma + 1)
+        # El primer bin solo recibe valores iguales a `resolution`
+        return np.where(index == 0, 0.0, np.where(index == 1, self.resolution, value))
+
+# Acumula las curvas de estados y las métricas de cada réplica a medida que
+# terminan, sin guardar los historiales individuales.
+class EnsembleStatistics:
+    def __init__(self, max_iter, n_cells, quantiles=(0.05, 0.5, 0.95), relative_accuracy=0.01):
+        self.max_iter = max_iter
+        self.quantiles = tuple(quantiles)
+        # Los conteos y el tiempo de extinción son enteros: por debajo de 1 solo hay ceros
+        self.empty = RunningStats((max_iter,), (0, n_cells), relative_accuracy, 1)
+        self.burning = RunningStats((max_iter,), (0, n_cells), relative_accuracy, 1)
+        self.burned = RunningStats((max_iter,), (0, n_cells), relative_accuracy, 1)
+        # spread_rate = suma de quemadas / i <= 2 * n_cells para i >= 1
+        self.spread_rate = RunningStats((), (0, 2 * n_cells), relative_accuracy)
+        self.extinction_time = RunningStats((), (0, max_iter), relative_accuracy, 1)
+
+    @property
+    def count(self):
+        return self.extinction_time.count
+
+    # Añade una réplica con el formato de salida de run_simulation
+    def add_run(self, empty, burning, burned, spread_rate, extinction_time):
+        # Rellenar si la simulación terminó antes de max_iter
+        padding = self.max_iter - len(empty)
+        self.empty.update(np.pad(empty, (0, padding), 'edge'))
+        self.burning.update(np.pad(burning, (0, padding), 'constant', constant_values=0))
+        self.burned.update(np.pad(burned, (0, padding), 'edge'))
+        self.spread_rate.update(spread_rate)
+        self.extinction_time.update(extinction_time)
+
+    # Añade un lote de conteos (3, réplicas, max_iter) como los de
+    # run_ensemble_counts; las métricas se derivan igual que en run_simulation
+    def add_counts(self, counts):
+        self.empty.update_many(counts[EMPTY])
+        self.burning.update_many(counts[BURNING])
+        self.burned.update_many(counts[BURNED])
+        extinct = counts[BURNING] == 0
+        extinction_time = np.where(extinct.any(axis=1), extinct.argmax(axis=1), self.max_iter - 1)
+        steps = np.arange(self.max_iter)
+        burned_area = np.where(steps <= extinction_time[:, np.newaxis], counts[BURNED], 0).sum(axis=1)
+        spread_rate = np.where(extinction_time > 0, burned_area / np.maximum(extinction_time, 1), 0)
+        self.spread_rate.update_many(spread_rate)
+        self.extinction_time.update_many(extinction_time)
+
+    def merge(self, other):
+        for name in ("empty", "burning", "burned", "spread_rate", "extinction_time"):
+            getattr(self, name).merge(getattr(other, name))
+        return self
+
+    # Resumen en el formato de run_simulations_with_averages: avg_* más
+    # varianza, intervalo de confianza y cuantiles de cada curva y métrica
+    def summary(self, level=0.95):
+        summary = {"num_simulations": self.count}
+        for name in ("empty", "burning", "burned"):
+            stats = getattr(self, name)
+            summary[f"avg_{name}"] = stats.mean
+            summary[f"var_{name}"] = stats.variance
+            summary[f"ci_{name}"] = stats.confidence_interval(level)
+            summary[f"quantiles_{name}"] = {q: stats.quantile(q) for q in self.quantiles}
+        for name in ("spread_rate", "extinction_time"):
+            stats = getattr(self, name)
+            summary[name] = float(stats.mean)
+            summary[f"{name}_var"] = float(stats.variance)
+            summary[f"{name}_ci"] = tuple(float(v) for v in stats.confidence_interval(level))
+            summary[f"{name}_quantiles"] = {q: float(stats.quantile(q)) for q in self.quantiles}
+        return summary
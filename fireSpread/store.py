@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+
+from .atomic import save_npz
+
+# Almacén columnar de resultados en un directorio: cada bloque es un .npz con
+# una columna (arreglo 1D) por campo y todas de la misma longitud. Las filas
+# se añaden en memoria y se escriben en bloques de `chunk_rows`, de forma
+# atómica; al leer solo se cargan las columnas pedidas de cada bloque.
+#
+#   chunk_000000.npz   scenario, model, replica, beta, ..., spread_rate, ...
+
+def _chunk_path(path, index):
+    return os.path.join(path, f"chunk_{index:06d}.npz")
+
+# Valor de relleno de una columna que falta en un bloque
+def _missing(dtype, size):
+    if dtype.kind in "US":
+        return np.full(size, "", dtype=dtype)
+    return np.full(size, np.nan)
+
+class ResultStore:
+    def __init__(self, path, chunk_rows=100_000):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self._pending = []
+        self._pending_rows = 0
+        os.makedirs(path, exist_ok=True)
+
+    def chunks(self):
+        return sorted(os.path.join(self.path, name) for name in os.listdir(self.path)
+                      if name.startswith("chunk_") and name.endswith(".npz"))
+
+    # Añade un lote de filas: un dict columna -> arreglo (o escalar, que se
+    # repite en todas las filas del lote)
+    def append(self, columns):
+        size = max(np.size(value) for value in columns.values())
+        self._pending.append({name: np.broadcast_to(np.asarray(value), (size,)) for name, value in columns.items()})
+        self._pending_rows += size
+        if self._pending_rows >= self.chunk_rows:
+            self.flush()
+
+    # Escribe las filas pendientes como un bloque nuevo
+    def flush(self):
+        if not self._pending:
+            return
+        names = list(dict.fromkeys(name for batch in self._pending for name in batch))
+        dtypes = {name: np.result_type(*(batch[name] for batch in self._pending if name in batch))
+                  for name in names}
+        columns = {name: np.concatenate([batch[name] if name in batch else
+                                         _missing(dtypes[name], len(next(iter(batch.values()))))
+                                         for batch in self._pending])
+                   for name in names}
+        save_npz(_chunk_path(self.path, len(self.chunks())), columns)
+        self._pending, self._pending_rows = [], 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Nombres de columna presentes en algún bloque
+    def columns(self):
+        names = {}
+        for chunk in self.chunks():
+            with np.load(chunk) as data:
+                names.update(dict.fromkeys(data.files))
+        return list(names)
+
+    # Carga las columnas pedidas (todas por defecto) como dict de arreglos.
+    # `where` filtra las filas: dict columna -> valor (o lista de valores
+    # aceptados) o una función que recibe todas las columnas y devuelve una
+    # máscara.
+    def load(self, columns=None, where=None):
+        names = self.columns() if columns is None else list(columns)
+        # Un filtro como función puede usar cualquier columna
+        needed = self.columns() if callable(where) else names + [name for name in (where or ()) if name not in names]
+        parts, sizes = {name: [] for name in needed}, []
+        for chunk in self.chunks():
+            with np.load(chunk) as data:
+                sizes.append(len(data[data.files[0]]))
+                for name in needed:
+                    parts[name].append(data[name] if name in data.files else None)
+        loaded = {}
+        for name, values in parts.items():
+            present = [v for v in values if v is not None]
+            dtype = present[0].dtype if present else np.dtype(float)
+            values = [_missing(dtype, size) if v is None else v for v, size in zip(values, sizes)]
+            loaded[name] = np.concatenate(values) if values else np.empty(0, dtype=dtype)
+        if where is not None:
+            mask = _mask(loaded, where)
+            loaded = {name: values[mask] for name, values in loaded.items()}
+        return {name: loaded[name] for name in names}
+
+    # Estadísticas de `value` por grupo (combinación de las columnas `by`)
+    def aggregate(self, by, value, where=None):
+        return aggregate(self.load(list(by) + [value], where), by, value)
+
+def _mask(columns, where):
+    if callable(where):
+        return np.asarray(where(columns), dtype=bool)
+    mask = np.ones(len(next(iter(columns.values()))), dtype=bool)
+    for name, accepted in where.items():
+        mask &= np.isin(columns[name], np.atleast_1d(accepted))
+    return mask
+
+# Agrupa las filas por las columnas `by` y devuelve, por grupo, las claves y
+# el número de filas, la media, la desviación estándar, el mínimo y el máximo
+# de la columna `value` (dict de columnas, una fila por grupo)
+def aggregate(columns, by, value):
+    keys = np.rec.fromarrays([columns[name] for name in by], names=list(by))
+    groups, inverse = np.unique(keys, return_inverse=True)
+    values = np.asarray(columns[value], dtype=float)
+    count = np.bincount(inverse, minlength=len(groups))
+    mean = np.bincount(inverse, values, len(groups)) / count
+    variance = np.bincount(inverse, (values - mean[inverse]) ** 2, len(groups)) / np.maximum(count - 1, 1)
+    low = np.full(len(groups), np.inf)
+    high = np.full(len(groups), -np.inf)
+    np.minimum.at(low, inverse, values)
+    np.maximum.at(high, inverse, values)
+    result = {name: groups[name] for name in by}
+    result.update(count=count, mean=mean, std=np.sqrt(variance), min=low, max=high)
+    return result
@@ -0,0 +1,123 @@
+import queue
+from collections import namedtuple
+
+import numpy as np
+
+from .counterrng import advance
+from .kernels import count_states, fire_is_out, update_counts
+from .simulation import ITERATIONS, model_step
+
+# Flujo de fotogramas de una simulación. `stream` es un generador: cada paso
+# se calcula solo cuando el consumidor pide el siguiente fotograma, así que
+# quien lee marca el ritmo y no se acumula historia. Los fotogramas llevan
+# una vista de solo lectura del buffer del motor (sin copia) que refleja el
+# paso del fotograma hasta que se pide el siguiente; quien necesite conservarla
+# debe llamar a `frame.copy()`.
+#
+#   for frame in stream_simulation(0.65, 0.3, 50):
+#       view.update(frame.grid, f"Iteración {frame.step+1}")
+#
+#   with QueueSubscriber(maxsize=8) as remote:
+#       threading.Thread(target=send_all, args=(remote,)).start()
+#       broadcast(stream_simulation(0.65, 0.3, 50), remote, writer_consumer, collector)
+
+class Frame(namedtuple("Frame", "step grid counts")):
+    __slots__ = ()
+
+    # Fotograma con una copia propia (escribible) de la cuadrícula
+    def copy(self):
+        return Frame(self.step, np.array(self.grid), self.counts.copy())
+
+# Genera los fotogramas de una simulación: `step(grid, out, counters)` avanza
+# un paso in situ (como en simulation._run) sobre una copia de `grid`. Con stop_when_out=True termina tras el
+# primer fotograma sin celdas en llamas. Un CounterRNG en `rng` se avanza
+# un paso tras cada actualización.
+def stream(grid, step, max_iter=ITERATIONS, stop_when_out=True, rng=None):
+    grid = np.array(grid)
+    counts = count_states(grid)
+    for i in range(max_iter):
+        view = grid.view()
+        view.flags.writeable = False
+        yield Frame(i, view, counts.copy())
+        if stop_when_out and fire_is_out(counts):
+            return
+
+        counters = {}
+        grid = step(grid, grid, counters)
+        advance(rng)
+        update_counts(counts, counters)
+
+def stream_simulation(beta, gamma, grid_size, max_iter=ITERATIONS, rng=None):
+    grid, step = model_step("sir", {"beta": beta, "gamma": gamma}, grid_size, rng)
+    return stream(grid, step, max_iter, rng=rng)
+
+def stream_simulation_wind(diffusion_rate, wind_direction, wind_influence, grid_size,
+                           max_iter=ITERATIONS, rng=None):
+    sim = {"diffusion_rate": diffusion_rate, "wind_direction": wind_direction, "wind_influence": wind_influence}
+    grid, step = model_step("wind", sim, grid_size, rng)
+    return stream(grid, step, max_iter, rng=rng)
+
+# Entrega cada fotograma a todos los consumidores (funciones de un
+# argumento) antes de avanzar la simulación y devuelve el último fotograma
+def broadcast(frames, *consumers):
+    frame = None
+    for frame in frames:
+        for consumer in consumers:
+            consumer(frame)
+    return frame
+
+_CLOSED = object()
+
+# Consumidor para otro hilo (gráfico en vivo, envío por red...): los
+# fotogramas se copian a una cola acotada. Con la cola llena el productor
+# espera (contrapresión) o, con drop=True, se descarta el fotograma y se
+# cuenta en `dropped`. Se recorre como iterador hasta que se cierra.
+class QueueSubscriber:
+    def __init__(self, maxsize=8, drop=False):
+        self.drop = drop
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+
+    def __call__(self, frame):
+        if not self.drop:
+            self._queue.put(frame.copy())
+            return
+        try:
+            self._queue.put_nowait(frame.copy())
+        except queue.Full:
+            self.dropped += 1
+
+    def __iter__(self):
+        while True:
+            frame = self._queue.get()
+            if frame is _CLOSED:
+                return
+            yield frame
+
+    # Marca el final del flujo (espera a que haya sitio en la cola)
+    def close(self):
+        self._queue.put(_CLOSED)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Consumidor que acumula los conteos y devuelve las métricas en el formato
+# de run_simulation (se pasan a EnsembleStatistics.add_run)
+class CountsCollector:
+    def __init__(self):
+        self.empty_counts, self.burning_counts, self.burned_counts = [], [], []
+
+    def __call__(self, frame):
+        empty, burning, burned = frame.counts
+        self.empty_counts.append(empty)
+        self.burning_counts.append(burning)
+        self.burned_counts.append(burned)
+
+    def result(self):
+        i = len(self.empty_counts) - 1
+        burned_area = np.sum(self.burned_counts)
+        spread_rate = burned_area / i if i > 0 else 0
+        return self.empty_counts, self.burning_counts, self.burned_counts, spread_rate, i
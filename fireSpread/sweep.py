@@ -0,0 +1,163 @@
+import collections
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .simulation import GRID_SIZE, ITERATIONS, MODELS, run_model
+from .stats import EnsembleStatistics
+
+# Barridos de parámetros en paralelo. Cada trabajo (configuración, réplica)
+# recibe su propia semilla derivada de una semilla maestra, de modo que los
+# resultados no dependen del número de procesos y cualquier réplica se puede
+# volver a ejecutar por separado con run_replica.
+
+# Semilla independiente del trabajo (config_index, replica_index)
+def replica_seed(master_seed, config_index, replica_index):
+    return np.random.SeedSequence(master_seed, spawn_key=(config_index, replica_index))
+
+# Ejecuta una sola réplica de una configuración
+def run_replica(model, sim, master_seed, config_index, replica_index,
+                max_iter=ITERATIONS, grid_size=GRID_SIZE):
+    rng = np.random.default_rng(replica_seed(master_seed, config_index, replica_index))
+    return run_model(model, sim, sim.get("grid_size", grid_size), max_iter, rng)
+
+# Conteos (3, réplicas, max_iter) y métricas (2, réplicas) de una lista de
+# resultados de run_simulation, rellenando las curvas como
+# EnsembleStatistics.add_run
+def pack_runs(runs, max_iter):
+    counts = np.zeros((3, len(runs), max_iter), dtype=np.int64)
+    metrics = np.zeros((2, len(runs)))
+    for r, (empty, burning, burned, spread_rate, extinction_time) in enumerate(runs):
+        length = len(empty)
+        counts[:, r, :length] = empty, burning, burned
+        counts[0, r, length:] = empty[-1]
+        counts[2, r, length:] = burned[-1]
+        metrics[:, r] = spread_rate, extinction_time
+    return counts, metrics
+
+def _run_job(job):
+    return run_replica(*job)
+
+# Ejecuta todas las réplicas de todas las configuraciones en un pool de
+# procesos (workers=1 las ejecuta en el proceso actual) y devuelve los
+# promedios por configuración. Los resultados se acumulan siempre en el orden
+# de los trabajos, así que son idénticos bit a bit para cualquier `workers`,
+# y a medida que llegan: sin caché la memoria no crece con el número de
+# réplicas. Con una `cache` (ResultCache) solo se simulan las réplicas que no
+# están guardadas y las nuevas se añaden a la entrada de su configuración
+# (solo se guardan en memoria las réplicas de la entrada que se escribe).
+def run_sweep(simulations, num_simulations, model="sir", master_seed=0,
+              max_iter=ITERATIONS, grid_size=GRID_SIZE, workers=None, cache=None):
+    averaged_metrics = []
+    for c, sim, size, entry, start, runs in _config_results(simulations, num_simulations, model, master_seed,
+                                                            max_iter, grid_size, workers, cache):
+        stats = EnsembleStatistics(max_iter, size * size)
+        if entry is not None:
+            counts, metrics = entry
+            for r in range(start):
+                stats.add_run(counts[0, r], counts[1, r], counts[2, r], metrics[0, r], metrics[1, r])
+        new_runs = []
+        for run in runs:
+            stats.add_run(*run)
+            if cache is not None:
+                new_runs.append(run)
+        if new_runs:
+            _store(cache, model, sim, size, max_iter, master_seed, c, entry, start, new_runs)
+        averaged_metrics.append({**sim, **stats.summary()})
+
+    return averaged_metrics
+
+# Como run_sweep, pero devuelve los resultados por réplica de cada
+# configuración: conteos (3, réplicas, max_iter) y métricas (2, réplicas)
+# (velocidad de propagación y tiempo de extinción). `config_indices` fija el
+# índice de semilla de cada configuración (por defecto su posición).
+def run_sweep_replicas(simulations, num_simulations, model="sir", master_seed=0, max_iter=ITERATIONS,
+                       grid_size=GRID_SIZE, workers=None, cache=None, config_indices=None):
+    packed = []
+    for c, sim, size, entry, start, runs in _config_results(simulations, num_simulations, model, master_seed,
+                                                            max_iter, grid_size, workers, cache, config_indices):
+        runs = list(runs)
+        if cache is not None and runs:
+            packed.append(_store(cache, model, sim, size, max_iter, master_seed, c, entry, start, runs))
+        else:
+            packed.append(_merge_entry(entry, start, pack_runs(runs, max_iter)))
+    return packed
+
+# Recorre las configuraciones en orden: para cada una da (índice de semilla,
+# parámetros, tamaño, entrada de la caché o None, réplicas ya guardadas,
+# iterador de los resultados de las réplicas nuevas). Cada iterador se debe
+# consumir antes de pedir la configuración siguiente.
+def _config_results(simulations, num_simulations, model, master_seed, max_iter, grid_size, workers, cache,
+                    config_indices=None):
+    if model not in MODELS:
+        raise ValueError(f"Modelo desconocido: {model!r} (opciones: {', '.join(MODELS)})")
+    if master_seed is None:
+        cache = None  # Sin semilla fija los resultados no se pueden reutilizar
+    indices = range(len(simulations)) if config_indices is None else config_indices
+    configs = list(zip(indices, simulations))
+    entries = [cache.get(model, sim, sim.get("grid_size", grid_size), max_iter, master_seed, c) if cache else None
+               for c, sim in configs]
+    cached = [0 if entry is None else min(entry[0].shape[1], num_simulations) for entry in entries]
+    jobs = [(model, sim, master_seed, c, r, max_iter, grid_size)
+            for (c, sim), start in zip(configs, cached) for r in range(start, num_simulations)]
+    workers = workers or os.cpu_count() or 1
+    results = ordered_map(_run_job, jobs, workers, chunksize=min(16, max(1, len(jobs) // (4 * workers))))
+    for (c, sim), entry, start in zip(configs, entries, cached):
+        runs = itertools.islice(results, num_simulations - start)
+        yield c, sim, sim.get("grid_size", grid_size), entry, start, runs
+        for _ in runs:  # Réplicas que el consumidor no leyó
+            pass
+
+# Conteos y métricas de las réplicas guardadas [0, start) seguidos de los nuevos
+def _merge_entry(entry, start, packed):
+    if entry is None:
+        return packed
+    counts, metrics = packed
+    return (np.concatenate([entry[0][:, :start], counts], axis=1),
+            np.concatenate([entry[1][:, :start], metrics], axis=1))
+
+# Escribe en la caché la entrada de una configuración con sus réplicas
+# nuevas `runs` y la devuelve
+def _store(cache, model, sim, size, max_iter, master_seed, config_index, entry, start, runs):
+    counts, metrics = _merge_entry(entry, start, pack_runs(runs, max_iter))
+    cache.put(model, sim, size, max_iter, master_seed, config_index, counts, metrics)
+    return counts, metrics
+
+# Resultados de function(job) para cada trabajo, en el orden de los
+# trabajos, con a lo sumo `window` trabajos en curso o terminados sin
+# consumir (por defecto 4 por proceso): los trabajos se piden de forma
+# perezosa y la memoria no crece con su número. Con workers=1 se ejecutan en
+# el proceso actual; `pool` reutiliza un ProcessPoolExecutor abierto entre
+# llamadas. Es el único ejecutor de los barridos (run_sweep, las
+# configuraciones de scenarios, fireSpread.adaptive y fireSpread.spatial).
+# Con chunksize > 1 los trabajos se envían en grupos (la ventana cuenta
+# grupos) para repartir el coste de comunicación de los trabajos cortos.
+def ordered_map(function, jobs, workers=None, window=None, pool=None, chunksize=1):
+    workers = workers or os.cpu_count() or 1
+    if pool is None and workers == 1:
+        yield from map(function, jobs)
+        return
+    window = window or 4 * workers
+    if pool is not None:
+        yield from _ordered_futures(pool, function, jobs, window, chunksize)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        yield from _ordered_futures(pool, function, jobs, window, chunksize)
+
+def _map_chunk(function, chunk):
+    return [function(job) for job in chunk]
+
+def _ordered_futures(pool, function, jobs, window, chunksize):
+    pending = collections.deque()
+    jobs = iter(jobs)
+    while True:
+        chunk = list(itertools.islice(jobs, chunksize))
+        if not chunk:
+            break
+        pending.append(pool.submit(_map_chunk, function, chunk))
+        if len(pending) >= window:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
@@ -0,0 +1,80 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from .kernels import NEIGHBOURS
+
+# Modelo de terreno heterogéneo: la probabilidad de que una celda en llamas
+# encienda a cada vecino depende de la vegetación del vecino, de la proyección
+# del viento sobre la dirección de propagación y, opcionalmente, de la
+# pendiente. Los campos se calculan una vez por escenario, así que un paso
+# cuesta lo mismo que con el modelo uniforme (una consulta y una comparación).
+
+# Bonificación de viento de cada dirección de NEIGHBOURS: influencia por la
+# proyección positiva de la dirección del viento (normalizada: la intensidad
+# la da solo wind_influence) sobre la dirección de propagación. Un viento
+# alineado con un eje reproduce la coincidencia exacta de update_grid_diffusion;
+# (1, 1) o (0.5, 0.5) reparten el efecto entre las dos direcciones que cubren
+# (influence / sqrt(2) cada una).
+def wind_bonus(wind_direction, wind_influence):
+    wx, wy = wind_direction
+    norm = np.hypot(wx, wy)
+    if norm == 0:
+        return np.zeros(len(NEIGHBOURS))
+    return np.array([wind_influence * max(0.0, (dx * wx + dy * wy) / norm) for dx, dy in NEIGHBOURS])
+
+# Desplaza un campo (H, W) para leer en cada celda el valor de su vecino en
+# la dirección (dx, dy); los bordes repiten el valor propio (no se usan:
+# los bordes nunca propagan)
+def _neighbour_values(field, dx, dy):
+    shifted = field.copy()
+    rows, cols = field.shape
+    shifted[max(-dx, 0):rows - max(dx, 0), max(-dy, 0):cols - max(dy, 0)] = \
+        field[max(dx, 0):rows + min(dx, 0), max(dy, 0):cols + min(dy, 0)]
+    return shifted
+
+# Campos (4, H, W): fields[k, i, j] es la probabilidad de que (i, j) en llamas
+# encienda a su vecino en NEIGHBOURS[k].
+#   vegetation        densidad (0-1) de cada celda; escala la probabilidad del
+#                     vecino por (1 - vegetation_weight) + vegetation_weight * densidad
+#   elevation         altura de cada celda; la propagación cuesta arriba se
+#                     multiplica por exp(slope_factor * desnivel)
+def spread_probability_fields(shape, diffusion_rate, wind_direction=(0, 0), wind_influence=0.0,
+                              vegetation=None, vegetation_weight=1.0, elevation=None, slope_factor=0.0):
+    base = diffusion_rate + wind_bonus(wind_direction, wind_influence)
+    fields = np.empty((4,) + tuple(shape))
+    for k, (dx, dy) in enumerate(NEIGHBOURS):
+        field = np.full(shape, base[k])
+        if vegetation is not None:
+            field *= (1 - vegetation_weight) + vegetation_weight * _neighbour_values(vegetation, dx, dy)
+        if elevation is not None and slope_factor:
+            field *= np.exp(slope_factor * (_neighbour_values(elevation, dx, dy) - elevation))
+        fields[k] = np.clip(field, 0, 1)
+    return fields
+
+def _digest(array):
+    if array is None:
+        return None
+    array = np.ascontiguousarray(array)
+    return (array.shape, array.dtype.str, hashlib.blake2b(array.data, digest_size=16).hexdigest())
+
+_cache = OrderedDict()
+CACHE_SIZE = 16
+
+# spread_probability_fields con caché (LRU de CACHE_SIZE escenarios) por
+# parámetros y contenido de los mapas de vegetación y elevación
+def cached_spread_probability_fields(shape, diffusion_rate, wind_direction=(0, 0), wind_influence=0.0,
+                                     vegetation=None, vegetation_weight=1.0, elevation=None, slope_factor=0.0):
+    key = (tuple(shape), diffusion_rate, tuple(wind_direction), wind_influence,
+           _digest(vegetation), vegetation_weight, _digest(elevation), slope_factor)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    fields = spread_probability_fields(shape, diffusion_rate, wind_direction, wind_influence,
+                                       vegetation, vegetation_weight, elevation, slope_factor)
+    fields.setflags(write=False)
+    _cache[key] = fields
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return fields
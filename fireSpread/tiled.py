@@ -0,0 +1,147 @@
+import json
+import os
+
+import numpy as np
+
+from .counterrng import advance, at
+from .kernels import EMPTY, BURNING, BURNED, GRID_DTYPE, update_grid, update_grid_diffusion
+from .simulation import ITERATIONS
+
+# Simulación por bloques sobre cuadrículas en disco (np.memmap) para paisajes
+# más grandes que la memoria. Cada bloque se procesa con un halo de una celda
+# usando los mismos kernels que en memoria; los bloques sin celdas en llamas
+# se saltan y un bloque se activa solo cuando el frente entra en él.
+class TiledSimulation:
+    def __init__(self, directory, shape, tile_size=1024, rng=None, mode="w+"):
+        self.directory = directory
+        self.shape = tuple(shape)
+        self.tile_size = tile_size
+        os.makedirs(directory, exist_ok=True)
+        self.grid = np.memmap(os.path.join(directory, "grid.dat"), dtype=GRID_DTYPE,
+                              mode=mode, shape=self.shape)
+        self.vegetation = np.memmap(os.path.join(directory, "vegetation.dat"), dtype=np.float32,
+                                    mode=mode, shape=self.shape)
+        self.tiles = tuple(-(-n // tile_size) for n in self.shape)
+        # Celdas en llamas por bloque; un bloque está activo si es > 0
+        self.tile_burning = np.zeros(self.tiles, dtype=np.int64)
+        self.counts = np.array([self.shape[0] * self.shape[1], 0, 0])
+
+        if mode == "w+":
+            # Densidad de vegetación (0-1) generada bloque a bloque
+            rng = np.random if rng is None else rng
+            for rows, cols in self._tile_slices():
+                self.vegetation[rows, cols] = rng.random((rows.stop - rows.start, cols.stop - cols.start))
+            with open(os.path.join(directory, "meta.json"), "w") as f:
+                json.dump({"shape": self.shape, "tile_size": tile_size}, f)
+        else:
+            # Reconstruir los conteos recorriendo el estado en disco bloque a bloque
+            self.counts[:] = 0
+            for (ti, tj), (rows, cols) in zip(np.ndindex(self.tiles), self._tile_slices()):
+                tile = self.grid[rows, cols]
+                for state in (EMPTY, BURNING, BURNED):
+                    self.counts[state] += np.count_nonzero(tile == state)
+                self.tile_burning[ti, tj] = np.count_nonzero(tile == BURNING)
+
+    # Reabre una simulación existente en `directory`
+    @classmethod
+    def open(cls, directory, mode="r+"):
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        return cls(directory, meta["shape"], meta["tile_size"], mode=mode)
+
+    def _tile_slices(self):
+        size = self.tile_size
+        for ti, tj in np.ndindex(self.tiles):
+            yield (slice(ti * size, min((ti + 1) * size, self.shape[0])),
+                   slice(tj * size, min((tj + 1) * size, self.shape[1])))
+
+    @property
+    def active_tiles(self):
+        return np.argwhere(self.tile_burning > 0)
+
+    # Enciende la celda (i, j)
+    def ignite(self, i, j):
+        if self.grid[i, j] == EMPTY:
+            self.grid[i, j] = BURNING
+            self.counts[EMPTY] -= 1
+            self.counts[BURNING] += 1
+            self.tile_burning[i // self.tile_size, j // self.tile_size] += 1
+
+    # Avanza un paso aplicando `update(window, row, col)` a cada bloque activo
+    # con su halo, cuya esquina es la celda global (row, col).
+    # Todos los cambios se calculan sobre el estado anterior y se escriben al
+    # final, igual que la copia new_grid de los kernels en memoria.
+    def _step(self, update):
+        size = self.tile_size
+        height, width = self.shape
+        changed, values = [], []
+        for ti, tj in self.active_tiles:
+            r0, c0 = max(ti * size - 1, 0), max(tj * size - 1, 0)
+            r1, c1 = min((ti + 1) * size + 1, height), min((tj + 1) * size + 1, width)
+            window = np.array(self.grid[r0:r1, c0:c1])
+            rows, cols = np.nonzero(update(window, r0, c0) != window)
+            changed.append((rows + r0) * width + cols + c0)
+            values.append(window[rows, cols])
+
+        if not changed:
+            return
+        changed, old = np.concatenate(changed), np.concatenate(values)
+        # Dos bloques pueden encender la misma celda de su halo común
+        ignited = np.unique(changed[old == EMPTY])
+        burned = changed[old == BURNING]
+
+        flat = self.grid.reshape(-1)
+        flat[ignited] = BURNING
+        flat[burned] = BURNED
+        self.counts += [-ignited.size, ignited.size - burned.size, burned.size]
+        np.add.at(self.tile_burning, self._tile_of(ignited), 1)
+        np.add.at(self.tile_burning, self._tile_of(burned), -1)
+
+    def _tile_of(self, flat):
+        rows, cols = np.divmod(flat, self.shape[1])
+        return rows // self.tile_size, cols // self.tile_size
+
+    # Un paso del modelo SIR (beta/gamma); con un CounterRNG cada bloque usa
+    # los números de sus celdas globales
+    def step(self, beta, gamma, rng=None):
+        self._step(lambda window, row, col: update_grid(window, beta, gamma, at(rng, row, col)))
+
+    # Un paso del modelo de difusión con viento
+    def step_diffusion(self, diffusion_rate, wind_direction, wind_influence, rng=None):
+        self._step(lambda window, row, col: update_grid_diffusion(window, diffusion_rate, wind_direction,
+                                                                  wind_influence, at(rng, row, col)))
+
+    def flush(self):
+        self.grid.flush()
+        self.vegetation.flush()
+
+# Equivalente de run_simulation_wind sobre una cuadrícula en disco de
+# grid_size x grid_size; los conteos se mantienen sin recorrer la cuadrícula
+def run_tiled_simulation_wind(directory, diffusion_rate, wind_direction, wind_influence, grid_size,
+                              max_iter=ITERATIONS, tile_size=1024, rng=None):
+    rng = np.random if rng is None else rng
+    simulation = TiledSimulation(directory, (grid_size, grid_size), tile_size, rng)
+    start_x, start_y = (rng.random(2) * grid_size).astype(int)
+    simulation.ignite(start_x, start_y)
+
+    empty_counts, burning_counts, burned_counts = [], [], []
+    for i in range(max_iter):
+        empty, burning, burned = simulation.counts
+        empty_counts.append(empty)
+        burning_counts.append(burning)
+        burned_counts.append(burned)
+
+        # Terminar si no hay celdas en llamas (extinción)
+        if burning == 0:
+            break
+
+        simulation.step_diffusion(diffusion_rate, wind_direction, wind_influence, rng)
+        advance(rng)
+    simulation.flush()
+
+    # Calcular velocidad de propagación y tiempo de extinción
+    burned_area = np.sum(burned_counts)
+    spread_rate = burned_area / i if i > 0 else 0
+    extinction_time = i
+
+    return empty_counts, burning_counts, burned_counts, spread_rate, extinction_time
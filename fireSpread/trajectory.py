@@ -0,0 +1,225 @@
+import json
+import os
+
+import numpy as np
+
+from .atomic import save_npz
+from .counterrng import CounterRNG, advance
+from .kernels import BURNING, GRID_DTYPE, count_states
+
+# Almacén de trayectorias en un directorio: fotogramas clave completos cada
+# `keyframe_interval` pasos y, entre ellos, solo las celdas que cambiaron en
+# cada paso, agrupadas en bloques comprimidos de `chunk_size` pasos. Cada
+# archivo se escribe de forma atómica, así que tras una interrupción se
+# conserva todo lo escrito hasta el último bloque o fotograma clave.
+#
+#   meta.json            forma, dtype, intervalos y metadatos del usuario
+#   key_00000100.npz     cuadrícula completa, conteos y estado del generador
+#   delta_00000101.npz   pasos, offsets, índices planos y valores nuevos
+
+def _key_path(path, step):
+    return os.path.join(path, f"key_{step:08d}.npz")
+
+def _delta_path(path, step):
+    return os.path.join(path, f"delta_{step:08d}.npz")
+
+def _steps(path, prefix):
+    return sorted(int(name[len(prefix):-4]) for name in os.listdir(path)
+                  if name.startswith(prefix) and name.endswith(".npz"))
+
+# Estado de un bit_generator apto para JSON: los arreglos (clave de MT19937,
+# contador de Philox, estado de SFC64...) se guardan como listas con su dtype
+# y _from_json los reconstruye
+def _to_json(value):
+    if isinstance(value, np.ndarray):
+        return {"ndarray": value.tolist(), "dtype": value.dtype.str}
+    if isinstance(value, dict):
+        return {name: _to_json(item) for name, item in value.items()}
+    return value
+
+def _from_json(value):
+    if isinstance(value, dict):
+        if "ndarray" in value:
+            return np.array(value["ndarray"], dtype=value["dtype"])
+        return {name: _from_json(item) for name, item in value.items()}
+    return value
+
+# Estado serializable del generador: CounterRNG, np.random.Generator,
+# RandomState o, con rng=None, el estado global de np.random (que al
+# reanudar se restaura en un RandomState propio)
+def _rng_state(rng):
+    if isinstance(rng, CounterRNG):
+        return json.dumps({"counter": rng.state})
+    if rng is None or isinstance(rng, np.random.RandomState):
+        name, key, pos, has_gauss, cached_gaussian = (np.random.get_state() if rng is None else rng.get_state())
+        return json.dumps({"random_state": [name, key.tolist(), pos, has_gauss, cached_gaussian]})
+    if isinstance(rng, np.random.Generator):
+        return json.dumps(_to_json(rng.bit_generator.state))
+    raise TypeError(f"No se puede guardar el estado de un generador {type(rng).__name__}")
+
+class TrajectoryWriter:
+    def __init__(self, path, shape, keyframe_interval=100, chunk_size=25, meta=None):
+        self.path = path
+        self.shape = tuple(shape)
+        self.keyframe_interval = keyframe_interval
+        self.chunk_size = chunk_size
+        self.step = 0
+        self._previous = None
+        self._pending = []
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"shape": self.shape, "dtype": np.dtype(GRID_DTYPE).name,
+                       "keyframe_interval": keyframe_interval, "chunk_size": chunk_size,
+                       "meta": meta or {}}, f)
+
+    # Reanuda la escritura desde el fotograma clave `step`, descartando todo
+    # lo grabado después
+    @classmethod
+    def resume(cls, path, step):
+        reader = TrajectoryReader(path)
+        previous = reader.frame(step)
+        for later in _steps(path, "key_"):
+            if later > step:
+                os.remove(_key_path(path, later))
+        for later in _steps(path, "delta_"):
+            if later > step:
+                os.remove(_delta_path(path, later))
+        writer = cls(path, reader.shape, reader.keyframe_interval, reader.chunk_size, reader.meta)
+        writer._previous = previous
+        writer.step = step + 1
+        return writer
+
+    # Graba el estado del paso actual; `rng` se guarda en los fotogramas clave
+    # para poder reanudar la simulación desde ellos
+    def append(self, grid, rng=None):
+        if self.step % self.keyframe_interval == 0:
+            self._flush()
+            save_npz(_key_path(self.path, self.step),
+                     {"grid": grid, "counts": count_states(grid), "rng_state": np.array(_rng_state(rng))})
+        else:
+            changed = np.flatnonzero(grid != self._previous)
+            self._pending.append((self.step, changed, grid.reshape(-1)[changed], count_states(grid)))
+            if len(self._pending) == self.chunk_size:
+                self._flush()
+        self._previous = np.array(grid, copy=True)
+        self.step += 1
+
+    def _flush(self):
+        if not self._pending:
+            return
+        steps, changed, values, counts = zip(*self._pending)
+        offsets = np.cumsum([0] + [c.size for c in changed])
+        save_npz(_delta_path(self.path, steps[0]),
+                 {"steps": np.array(steps), "offsets": offsets, "indices": np.concatenate(changed),
+                  "values": np.concatenate(values).astype(GRID_DTYPE), "counts": np.array(counts)})
+        self._pending = []
+
+    def close(self):
+        self._flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Lectura con acceso aleatorio: cualquier paso se reconstruye desde el
+# fotograma clave anterior aplicando solo los cambios posteriores
+class TrajectoryReader:
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.shape = tuple(meta["shape"])
+        self.keyframe_interval = meta["keyframe_interval"]
+        self.chunk_size = meta["chunk_size"]
+        self.meta = meta["meta"]
+        self.keyframes = _steps(path, "key_")
+        self.chunks = _steps(path, "delta_")
+
+    # Último paso grabado
+    @property
+    def last_step(self):
+        last = self.keyframes[-1] if self.keyframes else -1
+        if self.chunks and self.chunks[-1] > last:
+            with np.load(_delta_path(self.path, self.chunks[-1])) as chunk:
+                last = int(chunk["steps"][-1])
+        return last
+
+    def __len__(self):
+        return self.last_step + 1
+
+    def _keyframe_before(self, step):
+        keys = [k for k in self.keyframes if k <= step]
+        if not keys or step > self.last_step:
+            raise IndexError(f"Paso {step} fuera de la trayectoria")
+        return keys[-1]
+
+    def frame(self, step):
+        key = self._keyframe_before(step)
+        with np.load(_key_path(self.path, key)) as keyframe:
+            grid = keyframe["grid"]
+        flat = grid.reshape(-1)
+        for first in self.chunks:
+            if first <= key or first > step:
+                continue
+            with np.load(_delta_path(self.path, first)) as chunk:
+                steps, offsets = chunk["steps"], chunk["offsets"]
+                end = offsets[np.searchsorted(steps, step, side="right")]
+                flat[chunk["indices"][:end]] = chunk["values"][:end]
+        return grid
+
+    __getitem__ = frame
+
+    # Conteos (EMPTY, BURNING, BURNED) por paso, sin reconstruir cuadrículas
+    def counts(self):
+        counts = np.zeros((len(self), 3), dtype=int)
+        for key in self.keyframes:
+            with np.load(_key_path(self.path, key)) as keyframe:
+                counts[key] = keyframe["counts"]
+        for first in self.chunks:
+            with np.load(_delta_path(self.path, first)) as chunk:
+                counts[chunk["steps"]] = chunk["counts"]
+        return counts
+
+    # Cuadrícula y generador del fotograma clave `step` (por defecto el último)
+    def checkpoint(self, step=None):
+        step = self.keyframes[-1] if step is None else self._keyframe_before(step)
+        with np.load(_key_path(self.path, step)) as keyframe:
+            grid, state = keyframe["grid"], str(keyframe["rng_state"])
+        if not state:
+            raise ValueError(f"El fotograma clave {step} no guarda el estado del generador")
+        state = json.loads(state)
+        if "counter" in state:
+            return step, grid, CounterRNG.from_state(state["counter"])
+        if "random_state" in state:
+            name, key, pos, has_gauss, cached_gaussian = state["random_state"]
+            rng = np.random.RandomState()
+            rng.set_state((name, np.array(key, dtype=np.uint32), pos, has_gauss, cached_gaussian))
+            return step, grid, rng
+        rng = np.random.Generator(getattr(np.random, state["bit_generator"])())
+        rng.bit_generator.state = _from_json(state)
+        return step, grid, rng
+
+# Ejecuta y graba una simulación; `step(grid, out, rng)` avanza un paso.
+# Se detiene en max_iter o al extinguirse el fuego.
+def record_simulation(path, grid, step, max_iter, rng, keyframe_interval=100, chunk_size=25, meta=None):
+    with TrajectoryWriter(path, grid.shape, keyframe_interval, chunk_size, meta) as writer:
+        _record(writer, np.array(grid), step, max_iter, rng)
+
+# Reanuda una simulación grabada desde su último fotograma clave (o `start`)
+def resume_simulation(path, step, max_iter, start=None):
+    start, grid, rng = TrajectoryReader(path).checkpoint(start)
+    with TrajectoryWriter.resume(path, start) as writer:
+        if count_states(grid)[BURNING] > 0:
+            grid = step(grid, grid, rng)
+            advance(rng)
+            _record(writer, grid, step, max_iter, rng)
+
+def _record(writer, grid, step, max_iter, rng):
+    while True:
+        writer.append(grid, rng)
+        if writer.step >= max_iter or count_states(grid)[BURNING] == 0:
+            break
+        grid = step(grid, grid, rng)
+        advance(rng)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from fireSpread.counterrng import CounterRNG
+from fireSpread.ensemble import initialize_ensemble, run_ensemble_counts
+from fireSpread.kernels import update_grid, update_grid_diffusion
+from fireSpread.stream import stream
+
+# Con un CounterRNG cada réplica del lote debe coincidir con la misma
+# réplica ejecutada sola, también después de que otras se extingan
+
+def _single_counts(grid, kernel, replica, max_iter):
+    rng = CounterRNG(7, replica=replica)
+    step = lambda g, out, counters: kernel(g, out, rng, counters)
+    return np.array([frame.counts for frame in stream(grid, step, max_iter, rng=rng)]).T
+
+def _check_batched_matches_single(kernel):
+    num_replicas, size, max_iter = 6, 20, 60
+    grids = initialize_ensemble(num_replicas, size, np.random.default_rng(0))
+    initial = grids.copy()
+    rng = CounterRNG(7)
+    counts = run_ensemble_counts(kernel, grids, max_iter, rng)
+
+    extinct = []
+    for r in range(num_replicas):
+        single = _single_counts(initial[r], kernel, r, max_iter)
+        steps = single.shape[1]
+        extinct.append(steps < max_iter)
+        np.testing.assert_array_equal(counts[:, r, :steps], single)
+        # Tras extinguirse los conteos se mantienen constantes
+        np.testing.assert_array_equal(counts[:, r, steps:], np.repeat(single[:, -1:], max_iter - steps, axis=1))
+    # Al menos una réplica se apaga antes que las demás
+    assert any(extinct) and not all(extinct)
+
+def test_batched_sir_matches_single_replicas():
+    _check_batched_matches_single(lambda g, out, rng, counters: update_grid(g, 0.35, 0.3, rng, out, counters))
+
+def test_batched_diffusion_matches_single_replicas():
+    _check_batched_matches_single(lambda g, out, rng, counters: update_grid_diffusion(g, 0.45, (0, 1), 0.2, rng,
+                                                                                       out, counters))
@@ -0,0 +1,59 @@
+import numpy as np
+
+from fireSpread.counterrng import CounterRNG, advance
+from fireSpread.kernels import update_grid, update_grid_diffusion, update_grid_diffusion_loop, update_grid_loop
+from fireSpread.simulation import (
+    initialize_grid, run_simulation_wind, run_simulations_with_averages, run_simulations_with_averages_wind,
+)
+from fireSpread.tiled import run_tiled_simulation_wind
+
+# Con un CounterRNG el resultado no depende de cómo se ejecute la simulación:
+# en lote o réplica a réplica, con bucles o vectorizada, con el motor de
+# cuadrícula, de frente o por bloques en disco
+
+SIR = [{"beta": 0.4, "gamma": 0.3, "grid_size": 20}, {"beta": 0.6, "gamma": 0.2, "grid_size": 20}]
+WIND = [{"diffusion_rate": 0.4, "wind_direction": (0, 1), "wind_influence": 0.2}]
+
+# Los promedios se acumulan en otro orden, así que pueden diferir en redondeo
+def _assert_same_metrics(first, second):
+    assert len(first) == len(second)
+    for a, b in zip(first, second):
+        assert a.keys() == b.keys()
+        for key in a:
+            if isinstance(a[key], dict):
+                for q in a[key]:
+                    np.testing.assert_allclose(a[key][q], b[key][q], rtol=1e-12)
+            else:
+                np.testing.assert_allclose(a[key], b[key], rtol=1e-12)
+
+def test_batched_sir_averages_match_serial():
+    serial = run_simulations_with_averages(SIR, 8, 50, batched=False, rng=CounterRNG(1))
+    batched = run_simulations_with_averages(SIR, 8, 50, batched=True, rng=CounterRNG(1))
+    _assert_same_metrics(serial, batched)
+
+def test_batched_wind_averages_match_serial():
+    serial = run_simulations_with_averages_wind(WIND, 8, 50, grid_size=20, batched=False, rng=CounterRNG(1))
+    batched = run_simulations_with_averages_wind(WIND, 8, 50, grid_size=20, batched=True, rng=CounterRNG(1))
+    _assert_same_metrics(serial, batched)
+
+def test_loop_and_vectorized_kernels_match():
+    for loop, vectorized in [(lambda g, rng: update_grid_loop(g, 0.5, 0.3, rng),
+                              lambda g, rng: update_grid(g, 0.5, 0.3, rng)),
+                             (lambda g, rng: update_grid_diffusion_loop(g, 0.4, (0, 1), 0.2, rng),
+                              lambda g, rng: update_grid_diffusion(g, 0.4, (0, 1), 0.2, rng))]:
+        rng = CounterRNG(3)
+        grid = initialize_grid(16, ignitions=[(8, 8)])
+        for _ in range(20):
+            expected = loop(grid, rng)
+            np.testing.assert_array_equal(vectorized(grid, rng), expected)
+            grid = expected
+            advance(rng)
+
+def test_grid_front_and_tiled_engines_match(tmp_path):
+    args = (0.45, (0, 1), 0.2, 40, 80)
+    grid = run_simulation_wind(*args, rng=CounterRNG(5))
+    front = run_simulation_wind(*args, rng=CounterRNG(5), engine="front")
+    tiled = run_tiled_simulation_wind(str(tmp_path), *args, tile_size=16, rng=CounterRNG(5))
+    for result in (front, tiled):
+        for a, b in zip(grid, result):
+            np.testing.assert_array_equal(a, b)
@@ -1,7 +1,7 @@
-import os
-import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+from fireSpread.cache import ResultCache
+from fireSpread.plotting import plot_average_evolution, plot_comparative_metrics, plot_evolution
+from fireSpread.simulation import run_simulation_terrain
+from fireSpread.sweep import run_sweep
 
 # Configuraciones de simulación
 grid_size = 50            # Tamaño de la cuadrícula
@@ -13,180 +13,60 @@ simulations = [
     {"diffusion_rate": 0.9, "wind_direction": (0.5, 0.5), "wind_influence": 0.2}
 ]
 num_simulations = 50
-
-# Estados de la celda
-EMPTY = 0                 # Verde (sin quemar)
-BURNING = 1               # En llamas
-BURNED = 2                # Quemado
+master_seed = 0           # Semilla maestra del barrido (resultados reproducibles y cacheables)
+vegetation_weight = 0.0   # Combustible uniforme: solo cuentan la difusión y el viento
 
 # Directorio para guardar gráficos
 output_dir = "simulation_results_wind"
-os.makedirs(output_dir, exist_ok=True)
-
-# Inicialización de la cuadrícula y vegetación
-def initialize_grid(size):
-    grid = np.zeros((size, size), dtype=int)
-    vegetation = np.random.rand(size, size)  # Densidad de vegetación (0-1)
-    start_x, start_y = np.random.randint(0, size), np.random.randint(0, size)
-    grid[start_x, start_y] = BURNING
-    return grid, vegetation
-
-# Actualización del estado de la cuadrícula con difusión y viento
-def update_grid_diffusion(grid, diffusion_rate, wind_direction, wind_influence):
-    new_grid = grid.copy()
-    for i in range(1, grid.shape[0] - 1):
-        for j in range(1, grid.shape[1] - 1):
-            if grid[i, j] == BURNING:
-                new_grid[i, j] = BURNED  # La celda se quema
-                for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                    ni, nj = i + dx, j + dy
-                    if grid[ni, nj] == EMPTY:
-                        # Ajuste de difusión por dirección e influencia del viento
-                        diffusion_prob = diffusion_rate
-                        if (dx, dy) == wind_direction:
-                            diffusion_prob += wind_influence
-                        if np.random.rand() < diffusion_prob:
-                            new_grid[ni, nj] = BURNING
-    return new_grid
-
-# Función para ejecutar una simulación y calcular métricas
-def run_simulation(diffusion_rate, wind_direction, wind_influence, grid_size, max_iter=iterations):
-    grid, vegetation = initialize_grid(grid_size)
-    empty_counts, burning_counts, burned_counts = [], [], []
-    
-    for i in range(max_iter):
-        empty_counts.append(np.sum(grid == EMPTY))
-        burning_counts.append(np.sum(grid == BURNING))
-        burned_counts.append(np.sum(grid == BURNED))
-        
-        # Terminar si no hay celdas en llamas (extinción)
-        if np.sum(grid == BURNING) == 0:
-            break
-        
-        grid = update_grid_diffusion(grid, diffusion_rate, wind_direction, wind_influence)
-    
-    # Calcular velocidad de propagación y tiempo de extinción
-    burned_area = np.sum(burned_counts)
-    spread_rate = burned_area / i if i > 0 else 0
-    extinction_time = i
 
-    return empty_counts, burning_counts, burned_counts, spread_rate, extinction_time
-
-# Ejecutar simulaciones múltiples y calcular promedios
-def run_simulations_with_averages_wind(simulations, num_simulations, max_iter=iterations):
-    averaged_metrics = []
+def main():
+    # Ejecutar y graficar resultados (barrido con caché: las configuraciones
+    # ya simuladas se leen del disco)
+    # Se usa el modelo de terreno, que proyecta el viento sobre cada dirección:
+    # el modelo "wind" solo aplica el viento cuando coincide exactamente con
+    # un vecino, así que (1, 1) y (0.5, 0.5) se quedarían sin efecto
+    sweep = [{**sim, "vegetation_weight": vegetation_weight} for sim in simulations]
+    averaged_metrics_wind = run_sweep(sweep, num_simulations, "terrain", master_seed, max_iter=iterations,
+                                      grid_size=grid_size, cache=ResultCache())
+
+    for metrics in averaged_metrics_wind:
+        diffusion_rate = metrics["diffusion_rate"]
+        wind_direction = metrics["wind_direction"]
+        wind_influence = metrics["wind_influence"]
+        plot_average_evolution(
+            metrics,
+            f"Promedio de evolución con viento - Difusión: {diffusion_rate}, Dirección: {wind_direction}, Influencia: {wind_influence}",
+            f"{output_dir}/average_evolution_diffusion_{diffusion_rate}_wind_{wind_direction}.png", show=True)
+
+    # Ejecución de simulaciones con diferentes parámetros
+    metrics = []
     for sim in simulations:
         diffusion_rate = sim["diffusion_rate"]
         wind_direction = sim["wind_direction"]
         wind_influence = sim["wind_influence"]
 
-        total_empty = np.zeros(max_iter)
-        total_burning = np.zeros(max_iter)
-        total_burned = np.zeros(max_iter)
-
-        for _ in range(num_simulations):
-            empty, burning, burned, _, _ = run_simulation(
-                diffusion_rate, wind_direction, wind_influence, grid_size, max_iter
-            )
-            
-            # Ajustar los tamaños de los resultados si la simulación terminó antes de max_iter
-            empty = np.pad(empty, (0, max_iter - len(empty)), 'edge')
-            burning = np.pad(burning, (0, max_iter - len(burning)), 'constant', constant_values=0)
-            burned = np.pad(burned, (0, max_iter - len(burned)), 'edge')
-
-            total_empty += np.array(empty)
-            total_burning += np.array(burning)
-            total_burned += np.array(burned)
-
-        avg_empty = total_empty / num_simulations
-        avg_burning = total_burning / num_simulations
-        avg_burned = total_burned / num_simulations
+        empty, burning, burned, spread_rate, extinction_time = run_simulation_terrain(
+            diffusion_rate, wind_direction, wind_influence, grid_size, vegetation_weight=vegetation_weight
+        )
 
-        averaged_metrics.append({
+        # Guardar resultados en métricas
+        metrics.append({
             "diffusion_rate": diffusion_rate,
             "wind_direction": wind_direction,
             "wind_influence": wind_influence,
-            "avg_empty": avg_empty,
-            "avg_burning": avg_burning,
-            "avg_burned": avg_burned
+            "spread_rate": spread_rate,
+            "extinction_time": extinction_time
         })
 
-    return averaged_metrics
-
-# Ejecutar y graficar resultados
-averaged_metrics_wind = run_simulations_with_averages_wind(simulations, num_simulations=50, max_iter=iterations)
-
-for metrics in averaged_metrics_wind:
-    diffusion_rate = metrics["diffusion_rate"]
-    wind_direction = metrics["wind_direction"]
-    wind_influence = metrics["wind_influence"]
-    avg_empty, avg_burning, avg_burned = metrics["avg_empty"], metrics["avg_burning"], metrics["avg_burned"]
-
-    plt.figure(figsize=(10, 6))
-    plt.plot(avg_empty, label="Empty (Verde)")
-    plt.plot(avg_burning, label="Burning (En llamas)")
-    plt.plot(avg_burned, label="Burned (Quemado)")
-    plt.xlabel("Iteración")
-    plt.ylabel("Promedio de cantidad de celdas")
-    plt.title(f"Promedio de evolución con viento - Difusión: {diffusion_rate}, Dirección: {wind_direction}, Influencia: {wind_influence}")
-    plt.legend()
-    plt.savefig(f"{output_dir}/average_evolution_diffusion_{diffusion_rate}_wind_{wind_direction}.png")
-    plt.show()
-
-# Ejecución de simulaciones con diferentes parámetros
-metrics = []
-for sim in simulations:
-    diffusion_rate = sim["diffusion_rate"]
-    wind_direction = sim["wind_direction"]
-    wind_influence = sim["wind_influence"]
-    
-    empty, burning, burned, spread_rate, extinction_time = run_simulation(
-        diffusion_rate, wind_direction, wind_influence, grid_size
-    )
-    
-    # Guardar resultados en métricas
-    metrics.append({
-        "diffusion_rate": diffusion_rate,
-        "wind_direction": wind_direction,
-        "wind_influence": wind_influence,
-        "spread_rate": spread_rate,
-        "extinction_time": extinction_time
-    })
-    
-    # Graficar evolución de los estados en el tiempo
-    plt.figure(figsize=(10, 6))
-    plt.plot(empty, label="Empty (Verde)")
-    plt.plot(burning, label="Burning (En llamas)")
-    plt.plot(burned, label="Burned (Quemado)")
-    plt.xlabel("Iteración")
-    plt.ylabel("Cantidad de celdas")
-    plt.title(f"Evolución del fuego - Difusión: {diffusion_rate}, Viento: {wind_direction}, Influencia: {wind_influence}")
-    plt.legend()
-    plt.savefig(f"{output_dir}/evolution_diffusion_{diffusion_rate}_wind_{wind_direction}.png")
-    plt.close()
-
-# Gráficos comparativos de las métricas
-diffusion_rates = [m["diffusion_rate"] for m in metrics]
-wind_influences = [m["wind_influence"] for m in metrics]
-spread_rates = [m["spread_rate"] for m in metrics]
-extinction_times = [m["extinction_time"] for m in metrics]
-
-plt.figure(figsize=(12, 6))
-
-# Gráfico de velocidad de propagación
-plt.subplot(1, 2, 1)
-plt.bar(range(len(spread_rates)), spread_rates, tick_label=[f"{d}, {w}" for d, w in zip(diffusion_rates, wind_influences)])
-plt.xlabel("(Difusión, Influencia del viento)")
-plt.ylabel("Velocidad de propagación")
-plt.title("Comparación de velocidad de propagación")
+        # Graficar evolución de los estados en el tiempo
+        plot_evolution(
+            empty, burning, burned,
+            f"Evolución del fuego - Difusión: {diffusion_rate}, Viento: {wind_direction}, Influencia: {wind_influence}",
+            f"{output_dir}/evolution_diffusion_{diffusion_rate}_wind_{wind_direction}.png")
 
-# Gráfico de tiempo de extinción
-plt.subplot(1, 2, 2)
-plt.bar(range(len(extinction_times)), extinction_times, tick_label=[f"{d}, {w}" for d, w in zip(diffusion_rates, wind_influences)])
-plt.xlabel("(Difusión, Influencia del viento)")
-plt.ylabel("Tiempo de extinción")
-plt.title("Comparación de tiempo de extinción")
+    # Gráficos comparativos de las métricas
+    plot_comparative_metrics(metrics, [f"{m['diffusion_rate']}, {m['wind_influence']}" for m in metrics],
+                             "(Difusión, Influencia del viento)", f"{output_dir}/comparative_metrics.png", show=True)
 
-plt.tight_layout()
-plt.savefig(f"{output_dir}/comparative_metrics.png")
-plt.show()
+if __name__ == "__main__":
+    main()